@@ -1,5 +1,4 @@
 import random
-import re
 
 MAX_REPEAT = 5
 
@@ -72,18 +71,24 @@ def generate_from_regex(regex, trace=False):
     final_result = parse_expression()
     return (final_result, trace_steps) if trace else final_result
 
-# Example usage with regex from Variant 1
-regexes = [
-    "(a|b)(c|d)E+G?",
-    "P(Q|R|S)T(uv|w|x)*Z+",
-    "1(0|1)*2(3|4)5"
-]
 
-for r in regexes:
-    result, steps = generate_from_regex(r, trace=True)
-    print(f"Regex: {r}")
-    print(f"Generated: {result}")
-    print("Trace:")
-    for s in steps:
-        print(f"  - {s}")
-    print("-" * 40)
+def main():
+    # Example usage with regex from Variant 1
+    regexes = [
+        "(a|b)(c|d)E+G?",
+        "P(Q|R|S)T(uv|w|x)*Z+",
+        "1(0|1)*2(3|4)5"
+    ]
+
+    for r in regexes:
+        result, steps = generate_from_regex(r, trace=True)
+        print(f"Regex: {r}")
+        print(f"Generated: {result}")
+        print("Trace:")
+        for s in steps:
+            print(f"  - {s}")
+        print("-" * 40)
+
+
+if __name__ == "__main__":
+    main()
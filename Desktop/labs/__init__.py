@@ -0,0 +1,43 @@
+"""Formal Languages & Finite Automata labs.
+
+Submodules are imported lazily on first attribute access (PEP 562), so
+``import labs`` costs next to nothing and only the engines actually used
+get loaded.  Run the lab demos with ``python -m labs <module>``.
+"""
+import importlib
+
+_SUBMODULES = {"finite_automaton", "asl2", "lfa3", "LFA4", "lfa55", "lfa66", "cfg_tables", "equivalence", "charclass",
+               "scanner", "counting", "instrumentation", "server", "benchmarks"}
+
+# Public names re-exported from the submodule that defines them.
+_EXPORTS = {
+    "FiniteAutomaton": "asl2",
+    "EPSILON": "asl2",
+    "CFG": "lfa55",
+    "generate_from_regex": "LFA4",
+    "LL1Table": "cfg_tables",
+    "LALR1Table": "cfg_tables",
+    "CharClass": "charclass",
+    "ClassDFA": "charclass",
+    "Scanner": "scanner",
+    "regex_to_automaton": "scanner",
+    "language": "counting",
+    "equivalent": "equivalence",
+    "included": "equivalence",
+}
+
+__all__ = sorted(_SUBMODULES | set(_EXPORTS))
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,23 @@
+import importlib
+import sys
+
+DEMOS = ["finite_automaton", "asl2", "lfa3", "LFA4", "lfa55", "lfa66", "cfg_tables", "charclass", "scanner", "counting", "benchmarks", "server"]
+
+# Modules whose main() takes its own command-line arguments.
+COMMANDS = {"benchmarks", "server"}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in DEMOS:
+        print(f"usage: python -m labs {{{','.join(DEMOS)}}} [args...]", file=sys.stderr)
+        return 2
+    module = importlib.import_module(f"{__package__}.{argv[0]}")
+    if argv[0] in COMMANDS:
+        return module.main(argv[1:])
+    module.main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,200 @@
 from collections import defaultdict
 from itertools import chain, combinations
 
+EPSILON = 'ε'
+
+
+def check_plain_symbols(symbols):
+    """Reject charclass.CharClass labels, which only charclass.ClassDFA interprets.
+
+    Everywhere else a label is an opaque symbol matched by equality, so
+    overlapping classes would silently give wrong answers.
+    """
+    for symbol in symbols:
+        if hasattr(symbol, 'intervals'):
+            raise Exception(f"CharClass label {symbol!r} is only supported by charclass.ClassDFA")
+
+
 class FiniteAutomaton:
+    """Finite automaton over state -> symbol -> set-of-states transitions (EPSILON marks ε-edges).
+
+    ε-closures and other derived data are cached.  add_transition(),
+    remove_transition() and assigning self.transitions keep the cache
+    current; after editing the transition dicts, states or final states
+    directly, call invalidate_closures().
+    """
+
     def __init__(self, states, alphabet, transitions, start_state, final_states):
-        self.states = states
+        self.states = set(states)
         self.alphabet = alphabet
-        self.transitions = transitions  
+        self.transitions = transitions
         self.start_state = start_state
-        self.final_states = final_states
+        self.final_states = set(final_states)
+
+    @property
+    def transitions(self):
+        return self._transitions
+
+    @transitions.setter
+    def transitions(self, transitions):
+        self._transitions = {state: {symbol: set(next_states) for symbol, next_states in paths.items()}
+                             for state, paths in transitions.items()}
+        self._version = getattr(self, '_version', 0)
+        self._checked_version = None
+        self.invalidate_closures()
+
+    @property
+    def cache(self):
+        """Derived data other modules keep per automaton; emptied whenever the automaton changes."""
+        self._validate_caches()
+        return self._cache
+
+    def invalidate_closures(self):
+        """Drop the cached ε-closures and everything in self.cache."""
+        self._version += 1
+        self._closures = None
+        self._step_masks = {}
+        self._cache = {}
+
+    def _validate_caches(self):
+        """Check the labels once per version of the transitions (a mutation counter)."""
+        if self._checked_version != self._version:
+            check_plain_symbols(symbol for paths in self._transitions.values() for symbol in paths)
+            self._checked_version = self._version
+
+    def add_transition(self, state, symbol, next_state):
+        """Add an edge (symbol may be EPSILON)."""
+        self._transitions.setdefault(state, {}).setdefault(symbol, set()).add(next_state)
+        self.invalidate_closures()
+
+    def remove_transition(self, state, symbol, next_state):
+        """Remove an edge if present."""
+        self._transitions.get(state, {}).get(symbol, set()).discard(next_state)
+        self.invalidate_closures()
+
+    def _closure_table(self):
+        """Bitset ε-closure of every state, built once with Tarjan's SCC condensation.
+
+        Returns (bits, closures): the bit assigned to each state and the
+        closure of each state as an int bitset.  Tarjan emits components in
+        reverse topological order, so every successor component's closure is
+        known by the time a component is closed off.
+        """
+        if self._closures is not None:
+            return self._closures
+        order = list(self.states)
+        seen = set(order)
+        for state, paths in self._transitions.items():
+            for next_state in chain([state], *paths.values()):
+                if next_state not in seen:
+                    seen.add(next_state)
+                    order.append(next_state)
+        bits = {state: 1 << i for i, state in enumerate(order)}
+        edges = {state: self._transitions.get(state, {}).get(EPSILON, ()) for state in order}
+
+        closures = {}
+        number, low = {}, {}
+        stack, on_stack = [], set()
+        for root in order:
+            if root in number:
+                continue
+            number[root] = low[root] = len(number)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(edges[root]))]
+            while work:
+                state, successors = work[-1]
+                for next_state in successors:
+                    if next_state not in number:
+                        number[next_state] = low[next_state] = len(number)
+                        stack.append(next_state)
+                        on_stack.add(next_state)
+                        work.append((next_state, iter(edges[next_state])))
+                        break
+                    if next_state in on_stack:
+                        low[state] = min(low[state], number[next_state])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[state])
+                    if low[state] == number[state]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == state:
+                                break
+                        mask = 0
+                        for member in component:
+                            mask |= bits[member]
+                            for next_state in edges[member]:
+                                mask |= closures.get(next_state, 0)
+                        for member in component:
+                            closures[member] = mask
+        self._closures = (bits, closures)
+        return self._closures
+
+    def _mask(self, states):
+        bits, closures = self._closure_table()
+        mask = 0
+        for state in states:
+            mask |= closures.get(state, 0)
+        return mask
+
+    def _states_of(self, mask):
+        bits, _ = self._closure_table()
+        return {state for state, bit in bits.items() if mask & bit}
+
+    def _step(self, mask, symbol):
+        """ε-closed successor bitset of a closed bitset; memoized per (state, symbol)."""
+        bits, closures = self._closure_table()
+        step_masks = self._step_masks.get(symbol)
+        if step_masks is None:
+            step_masks = self._step_masks[symbol] = {}
+            for state, bit in bits.items():
+                target = 0
+                for next_state in self._transitions.get(state, {}).get(symbol, ()):
+                    target |= closures[next_state]
+                if target:
+                    step_masks[bit] = target
+        result = 0
+        while mask:
+            bit = mask & -mask
+            result |= step_masks.get(bit, 0)
+            mask ^= bit
+        return result
+
+    def epsilon_closure(self, states):
+        """Set of states reachable from the given states through ε-edges alone."""
+        self._validate_caches()
+        return self._states_of(self._mask(states))
+
+    def accepts(self, input_string):
+        """Simulate the NFA (ε-edges included) on a string."""
+        self._validate_caches()
+        mask = self._mask([self.start_state])
+        for symbol in input_string:
+            mask = self._step(mask, symbol)
+            if not mask:
+                return False
+        return bool(mask & self._mask_of_finals())
+
+    def _mask_of_finals(self):
+        bits, _ = self._closure_table()
+        mask = 0
+        for state in self.final_states:
+            mask |= bits.get(state, 0)
+        return mask
+
+    def has_epsilon_transitions(self):
+        return any(paths.get(EPSILON) for paths in self._transitions.values())
 
     def is_deterministic(self):
         """Check if the FA is deterministic (DFA)."""
+        if self.has_epsilon_transitions():
+            return False
         for state, paths in self.transitions.items():
             for symbol in self.alphabet:
                 if len(paths[symbol]) > 1:
@@ -23,64 +207,262 @@ class FiniteAutomaton:
         for state, paths in self.transitions.items():
             for symbol, next_states in paths.items():
                 for next_state in next_states:
-                    rule = f"{symbol}{next_state}" if next_state else symbol
+                    if symbol == EPSILON:
+                        rule = next_state
+                    else:
+                        rule = f"{symbol}{next_state}" if next_state else symbol
                     grammar[state].append(rule)
         return grammar
 
     def ndfa_to_dfa(self):
-        """Convert an NDFA to DFA."""
+        """Convert an NDFA (ε-edges allowed) to a DFA with states d0, d1, ... in discovery order."""
+        self._validate_caches()
         dfa_states = {}
-        queue = [frozenset([self.start_state])]
+        start = self._mask([self.start_state])
+        final_mask = self._mask_of_finals()
+        queue = [start]
         new_transitions = {}
         new_final_states = set()
-        
+
         while queue:
-            current_set = queue.pop(0)
-            state_name = ''.join(sorted(current_set))  
-            dfa_states[current_set] = state_name
-            new_transitions[state_name] = {symbol: set() for symbol in self.alphabet}
-            
-            for state in current_set:
-                if state in self.final_states:
-                    new_final_states.add(state_name)
-                for symbol in self.alphabet:
-                    new_transitions[state_name][symbol] |= set(self.transitions[state][symbol])
-            
-            for new_state in new_transitions[state_name].values():
-                if new_state and frozenset(new_state) not in dfa_states:
-                    queue.append(frozenset(new_state))
-        
-        return FiniteAutomaton(set(dfa_states.values()), self.alphabet, new_transitions, dfa_states[frozenset([self.start_state])], new_final_states)
-
-# Given finite automaton
-states = {"q0", "q1", "q2", "q3", "q4"}
-alphabet = {"a", "b", "c"}
-transitions = {
-    "q0": {"a": {"q1"}, "b": set(), "c": set()},
-    "q1": {"b": {"q2", "q3"}, "a": set(), "c": set()},
-    "q2": {"b": set(), "a": set(), "c": {"q0"}},
-    "q3": {"a": {"q4"}, "b": {"q0"}, "c": set()},
-    "q4": {"a": set(), "b": set(), "c": set()}
-}
-start_state = "q0"
-final_states = {"q4"}
-
-fa = FiniteAutomaton(states, alphabet, transitions, start_state, final_states)
-
-print("Deterministic:", fa.is_deterministic())
-
-grammar = fa.to_regular_grammar()
-print("Regular Grammar:")
-for state, rules in grammar.items():
-    print(f"{state} -> {' | '.join(rules)}")
-
-if not fa.is_deterministic():
-    dfa = fa.ndfa_to_dfa()
-    print("\nConverted DFA:")
-    print("States:", dfa.states)
-    print("Final States:", dfa.final_states)
-    print("Transitions:")
-    for state, paths in dfa.transitions.items():
-        for symbol, next_state in paths.items():
-            print(f"δ({state}, {symbol}) = {next_state}")
-            #hi
\ No newline at end of file
+            current_mask = queue.pop(0)
+            if current_mask in dfa_states:
+                continue
+            state_name = f"d{len(dfa_states)}"
+            dfa_states[current_mask] = state_name
+            if current_mask & final_mask:
+                new_final_states.add(state_name)
+            new_transitions[state_name] = {}
+            for symbol in self.alphabet:
+                new_mask = self._step(current_mask, symbol)
+                new_transitions[state_name][symbol] = new_mask
+                if new_mask and new_mask not in dfa_states:
+                    queue.append(new_mask)
+
+        # Point the transitions at the DFA state names instead of the NFA state sets.
+        for paths in new_transitions.values():
+            for symbol, new_mask in paths.items():
+                paths[symbol] = {dfa_states[new_mask]} if new_mask else set()
+
+        return FiniteAutomaton(set(dfa_states.values()), self.alphabet, new_transitions, dfa_states[start], new_final_states)
+
+    def next_state(self, state, symbol):
+        """Successor of a state in a DFA, or None when the transition is missing."""
+        next_states = self.transitions.get(state, {}).get(symbol)
+        if not next_states:
+            return None
+        for next_state in next_states:
+            return next_state
+
+    def as_dfa(self):
+        """Return self if deterministic, otherwise the subset-construction DFA."""
+        self._validate_caches()
+        if self.has_epsilon_transitions():
+            return self.ndfa_to_dfa()
+        for paths in self.transitions.values():
+            if any(len(next_states) > 1 for next_states in paths.values()):
+                return self.ndfa_to_dfa()
+        return self
+
+    def minimize(self):
+        """Minimal DFA for the same language (Hopcroft's partition refinement).
+
+        Unreachable and dead states are dropped, missing transitions mean
+        rejection, and the states are renamed q0, q1, ... in BFS order.
+        """
+        dfa = self.as_dfa()
+        alphabet = sorted(dfa.alphabet)
+        # Reachable states; None is the implicit sink that completes the DFA.
+        reachable = [dfa.start_state]
+        seen = {dfa.start_state}
+        inverse = {symbol: defaultdict(set) for symbol in alphabet}
+        i = 0
+        while i < len(reachable):
+            state = reachable[i]
+            i += 1
+            for symbol in alphabet:
+                target = dfa.next_state(state, symbol) if state is not None else None
+                inverse[symbol][target].add(state)
+                if target not in seen:
+                    seen.add(target)
+                    reachable.append(target)
+
+        final = {state for state in reachable if state is not None and state in dfa.final_states}
+        partition = [block for block in (final, set(reachable) - final) if block]
+        work = [min(partition, key=len)] if len(partition) == 2 else []
+        while work:
+            splitter = work.pop()
+            for symbol in alphabet:
+                predecessors = set()
+                for state in splitter:
+                    predecessors |= inverse[symbol].get(state, set())
+                if not predecessors:
+                    continue
+                refined = []
+                for block in partition:
+                    inside = block & predecessors
+                    if inside and len(inside) < len(block):
+                        outside = block - inside
+                        refined += [inside, outside]
+                        if block in work:
+                            work.remove(block)
+                            work += [inside, outside]
+                        else:
+                            work.append(min(inside, outside, key=len))
+                    else:
+                        refined.append(block)
+                partition = refined
+
+        block_of = {state: index for index, block in enumerate(partition) for state in block}
+        representative = [next(iter(block)) for block in partition]
+        final_blocks = {block_of[state] for state in final}
+
+        # Blocks from which no final state is reachable are dead.
+        live = set(final_blocks)
+        changed = True
+        while changed:
+            changed = False
+            for index, state in enumerate(representative):
+                if index not in live and state is not None and any(
+                        block_of[dfa.next_state(state, symbol)] in live for symbol in alphabet):
+                    live.add(index)
+                    changed = True
+
+        start = block_of[dfa.start_state]
+        names = {start: "q0"}
+        order = [start]
+        for index in order:
+            state = representative[index]
+            if index not in live or state is None:
+                continue
+            for symbol in alphabet:
+                target = block_of[dfa.next_state(state, symbol)]
+                if target in live and target not in names:
+                    names[target] = f"q{len(names)}"
+                    order.append(target)
+
+        transitions = {}
+        for index in order:
+            state = representative[index]
+            transitions[names[index]] = {symbol: set() for symbol in alphabet}
+            if index not in live or state is None:
+                continue
+            for symbol in alphabet:
+                target = block_of[dfa.next_state(state, symbol)]
+                if target in live:
+                    transitions[names[index]][symbol].add(names[target])
+        return FiniteAutomaton(set(names.values()), set(alphabet), transitions, "q0",
+                               {names[index] for index in order if index in final_blocks})
+
+    def _product(self, other, accept):
+        """Reachable part of the product DFA, minimized.
+
+        A pair component of None means that automaton has already rejected.
+        """
+        left, right = self.as_dfa(), other.as_dfa()
+        alphabet = sorted(left.alphabet | right.alphabet)
+        start = (left.start_state, right.start_state)
+        transitions = {}
+        final_states = set()
+        queue = [start]
+        while queue:
+            pair = queue.pop()
+            if pair in transitions:
+                continue
+            p, q = pair
+            if accept(p is not None and p in left.final_states, q is not None and q in right.final_states):
+                final_states.add(pair)
+            transitions[pair] = {}
+            for symbol in alphabet:
+                target = (left.next_state(p, symbol) if p is not None else None,
+                          right.next_state(q, symbol) if q is not None else None)
+                if target == (None, None):
+                    transitions[pair][symbol] = set()
+                    continue
+                transitions[pair][symbol] = {target}
+                if target not in transitions:
+                    queue.append(target)
+        return FiniteAutomaton(set(transitions), set(alphabet), transitions, start, final_states).minimize()
+
+    def intersection(self, other):
+        """Minimal DFA accepting the strings accepted by both automata."""
+        return self._product(other, lambda a, b: a and b)
+
+    def union(self, other):
+        """Minimal DFA accepting the strings accepted by either automaton."""
+        return self._product(other, lambda a, b: a or b)
+
+    def difference(self, other):
+        """Minimal DFA accepting the strings accepted by self but not by other."""
+        return self._product(other, lambda a, b: a and not b)
+
+    def complement(self, alphabet=None):
+        """Minimal DFA accepting every string over the alphabet that self rejects."""
+        alphabet = set(self.alphabet if alphabet is None else alphabet)
+        universal = FiniteAutomaton({"q0"}, alphabet, {"q0": {symbol: {"q0"} for symbol in alphabet}}, "q0", {"q0"})
+        return universal.difference(self)
+
+    def intersection_is_empty(self, other):
+        """Check emptiness of the intersection without materializing the product.
+
+        Explores reachable pairs of ε-closed macrostates (bitsets) on the
+        fly, without determinizing either operand first, and stops at the
+        first pair that both automata accept; only the visited set is kept
+        in memory.
+        """
+        self._validate_caches()
+        other._validate_caches()
+        alphabet = self.alphabet & other.alphabet
+        left_finals, right_finals = self._mask_of_finals(), other._mask_of_finals()
+        start = (self._mask([self.start_state]), other._mask([other.start_state]))
+        seen = {start}
+        stack = [start]
+        while stack:
+            p, q = stack.pop()
+            if p & left_finals and q & right_finals:
+                return False
+            for symbol in alphabet:
+                target = (self._step(p, symbol), other._step(q, symbol))
+                if all(target) and target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return True
+
+
+def main():
+    # Given finite automaton
+    states = {"q0", "q1", "q2", "q3", "q4"}
+    alphabet = {"a", "b", "c"}
+    transitions = {
+        "q0": {"a": {"q1"}, "b": set(), "c": set()},
+        "q1": {"b": {"q2", "q3"}, "a": set(), "c": set()},
+        "q2": {"b": set(), "a": set(), "c": {"q0"}},
+        "q3": {"a": {"q4"}, "b": {"q0"}, "c": set()},
+        "q4": {"a": set(), "b": set(), "c": set()}
+    }
+    start_state = "q0"
+    final_states = {"q4"}
+
+    fa = FiniteAutomaton(states, alphabet, transitions, start_state, final_states)
+
+    print("Deterministic:", fa.is_deterministic())
+
+    grammar = fa.to_regular_grammar()
+    print("Regular Grammar:")
+    for state, rules in grammar.items():
+        print(f"{state} -> {' | '.join(rules)}")
+
+    if not fa.is_deterministic():
+        dfa = fa.ndfa_to_dfa()
+        print("\nConverted DFA:")
+        print("States:", dfa.states)
+        print("Final States:", dfa.final_states)
+        print("Transitions:")
+        for state, paths in dfa.transitions.items():
+            for symbol, next_state in paths.items():
+                print(f"δ({state}, {symbol}) = {next_state}")
+                #hi
+
+
+if __name__ == "__main__":
+    main()
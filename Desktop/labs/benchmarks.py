@@ -0,0 +1,287 @@
+"""Benchmark harness for the hot paths of the lab modules.
+
+Usage:
+    python -m labs benchmarks [--only NAME ...] [--output results.json]
+                         [--save-baseline baseline.json | --baseline baseline.json]
+
+Every benchmark builds a synthetic workload from a seeded generator, times
+--iterations calls (after one warm-up call) and reports throughput, p50/p99
+latency and the peak traced memory of one extra call as JSON.  With
+--baseline the results are compared against a stored run and the exit code
+is 1 if any p50 latency or peak memory grew by more than --tolerance.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+PACKAGE = __name__.rpartition(".")[0]
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(name):
+    """Import a lab submodule of this package."""
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+# Workload generators
+
+def random_nfa(rng, n, alphabet="abc", density=2):
+    """asl2.FiniteAutomaton with n states and up to `density` targets per (state, symbol)."""
+    asl2 = load("asl2")
+    states = [f"q{i}" for i in range(n)]
+    transitions = {state: {symbol: set(rng.sample(states, rng.randint(0, min(density, n))))
+                           for symbol in alphabet} for state in states}
+    final_states = set(rng.sample(states, max(1, n // 4)))
+    return asl2.FiniteAutomaton(set(states), set(alphabet), transitions, states[0], final_states)
+
+
+def random_dfa(rng, n, alphabet="abcd"):
+    """finite_automaton.FiniteAutomaton (total transition function) with n states."""
+    finite_automaton = load("finite_automaton")
+    states = [f"q{i}" for i in range(n)]
+    transitions = {(state, symbol): rng.choice(states) for state in states for symbol in alphabet}
+    accept_states = set(rng.sample(states, max(1, n // 4)))
+    return finite_automaton.FiniteAutomaton(set(states), set(alphabet), transitions, states[0], accept_states)
+
+
+def random_grammar(rng, k, terminals="ab", max_length=4):
+    """lfa55.CFG with k productions over single-letter non-terminals."""
+    lfa55 = load("lfa55")
+    non_terminals = [chr(ord('A') + i) for i in range(min(26, max(1, k // 3)))]
+    non_terminals[0] = 'S'
+    productions = {nt: [rng.choice(terminals)] for nt in non_terminals}
+    for _ in range(k - len(non_terminals)):
+        body = ''.join(rng.choice(non_terminals + list(terminals)) for _ in range(rng.randint(1, max_length)))
+        productions[rng.choice(non_terminals)].append(body)
+    return lfa55.CFG(set(non_terminals), set(terminals), 'S', productions)
+
+
+def random_source(rng, megabytes, dialect="lfa66"):
+    """Program text for lfa66.Parser, or for lfa3.Lexer (while ... endwhile, no braces)."""
+    target = int(megabytes * 1024 * 1024)
+    names = [f"x{i}" for i in range(16)]
+    parts = []
+    size = 0
+    while size < target:
+        name, other = rng.choice(names), rng.choice(names)
+        if rng.random() < 0.2:
+            if dialect == "lfa3":
+                stmt = f"while ({name} > {rng.randint(0, 99)})\n    {name} = {name} - 1;\nendwhile;\n"
+            else:
+                stmt = f"while ({name} > {rng.randint(0, 99)}) {{\n    {name} = {name} - 1;\n}}\n"
+        else:
+            stmt = f"{name} = ({other} + {rng.randint(0, 999)}) * {other} / 2;\n"
+        parts.append(stmt)
+        size += len(stmt)
+    return ''.join(parts)
+
+
+# Benchmarks: each returns (callable, units processed per call, unit name)
+
+def bench_fa_membership(rng, args):
+    fa = random_dfa(rng, args.states)
+    words = [''.join(rng.choice("abcd") for _ in range(args.word_length)) for _ in range(args.words)]
+
+    def run():
+        for word in words:
+            fa.string_belongs_to_language(word)
+    return run, len(words) * args.word_length, "symbols"
+
+
+def bench_ndfa_to_dfa(rng, args):
+    nfa = random_nfa(rng, args.nfa_states)
+
+    def run():
+        nfa.invalidate_closures()
+        nfa.ndfa_to_dfa()
+    return run, 1, "conversions"
+
+
+def bench_cfg_to_cnf(rng, args):
+    grammar = random_grammar(rng, args.rules)
+    lfa55 = load("lfa55")
+
+    def run():
+        copy = lfa55.CFG(set(grammar.VN), set(grammar.VT), grammar.S,
+                         {nt: list(rules) for nt, rules in grammar.P.items()})
+        copy.to_cnf()
+    return run, args.rules, "rules"
+
+
+def bench_lfa3_lexer(rng, args):
+    lfa3 = load("lfa3")
+    text = random_source(rng, args.megabytes, dialect="lfa3")
+
+    def run():
+        lexer = lfa3.Lexer(text)
+        while lexer.get_next_token().type != lfa3.TOKEN_EOF:
+            pass
+    return run, len(text), "bytes"
+
+
+def bench_lfa66_parser(rng, args):
+    lfa66 = load("lfa66")
+    text = random_source(rng, args.megabytes)
+
+    def run():
+        lfa66.Parser(lfa66.Lexer(text)).produce_ast()
+    return run, len(text), "bytes"
+
+
+def bench_generate_from_regex(rng, args):
+    LFA4 = load("LFA4")
+    regexes = ["(a|b)(c|d)E+G?", "P(Q|R|S)T(uv|w|x)*Z+", "1(0|1)*2(3|4)5"] * (args.words // 3)
+
+    def run():
+        for regex in regexes:
+            LFA4.generate_from_regex(regex)
+    return run, len(regexes), "strings"
+
+
+def sparse_text(rng, megabytes, needle="1001235", every=64 * 1024):
+    """Lowercase filler with a planted needle roughly every `every` characters."""
+    target = int(megabytes * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        filler = ''.join(rng.choice("abcdefghij ") for _ in range(256)) * (every // 256)
+        parts += [filler, needle]
+        size += len(filler) + len(needle)
+    return ''.join(parts)
+
+
+def _scan_benchmark(prefilter):
+    def bench(rng, args):
+        scanner_module = load("scanner")
+        scanner = scanner_module.Scanner(scanner_module.regex_to_automaton("1(0|1)*2(3|4)5"))
+        text = sparse_text(rng, args.megabytes * 20)
+
+        def run():
+            for _ in scanner.finditer(text, prefilter):
+                pass
+        return run, len(text), "bytes"
+    return bench
+
+
+IMPORTED_MODULES = [f"{PACKAGE}.{name}" for name in ("finite_automaton", "asl2", "lfa3", "LFA4", "lfa55", "lfa66")]
+
+
+def bench_import_time(rng, args):
+    """Cold import of every lab module in a fresh interpreter (startup included)."""
+    env = dict(os.environ, PYTHONPATH=PACKAGE_PARENT)
+    command = [sys.executable, "-c", "import " + ", ".join(IMPORTED_MODULES)]
+
+    def run():
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    return run, len(IMPORTED_MODULES), "modules"
+
+
+BENCHMARKS = {
+    "import_time": bench_import_time,
+    "fa_membership": bench_fa_membership,
+    "ndfa_to_dfa": bench_ndfa_to_dfa,
+    "cfg_to_cnf": bench_cfg_to_cnf,
+    "lfa3_lexer": bench_lfa3_lexer,
+    "lfa66_parser": bench_lfa66_parser,
+    "generate_from_regex": bench_generate_from_regex,
+    "literal_scan": _scan_benchmark(prefilter=True),
+    "literal_scan_no_prefilter": _scan_benchmark(prefilter=False),
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(run, units, unit, iterations):
+    run()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "unit": unit,
+        "throughput": units * len(timings) / sum(timings),
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "peak_kib": peak / 1024,
+        "iterations": iterations,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Names of the metrics that regressed by more than `tolerance` against the baseline."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if old is None:
+            continue
+        for metric in ("p50_ms", "peak_kib"):
+            if old[metric] and result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {old[metric]:.3f} -> {result[metric]:.3f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--states", type=int, default=64, help="DFA size for fa_membership")
+    parser.add_argument("--words", type=int, default=300, help="strings per call for membership and regex generation")
+    parser.add_argument("--word-length", type=int, default=64)
+    parser.add_argument("--nfa-states", type=int, default=12, help="NFA size n for ndfa_to_dfa")
+    parser.add_argument("--rules", type=int, default=30, help="number of grammar rules k for cfg_to_cnf")
+    parser.add_argument("--megabytes", type=float, default=0.05, help="source size m for the lexer and parser")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="stored report to compare against")
+    parser.add_argument("--save-baseline", help="also store this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {key: value for key, value in vars(args).items()
+                   if key not in ("only", "output", "baseline", "save_baseline")},
+        "benchmarks": {},
+    }
+    for name in args.only or BENCHMARKS:
+        rng = random.Random(args.seed)
+        random.seed(args.seed)
+        run, units, unit = BENCHMARKS[name](rng, args)
+        results["benchmarks"][name] = measure(run, units, unit, args.iterations)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(report + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+import hashlib
+import pickle
+from enum import Enum
+from typing import Set, Dict, List, Tuple, Optional, Iterable, Iterator, Sequence, Union
+
+EPSILON = 'ε'
+END_MARKER = '$'
+ERROR = -1
+# Part of every table fingerprint; bump when the pickled layout changes.
+TABLE_FORMAT = 1
+
+
+Rule = Union[str, Sequence[str]]
+
+
+def rule_symbols(rule: Rule) -> List[str]:
+    """Symbols of a production body.
+
+    A string body is split into single-character symbols ('ε' is the empty
+    body); a list body is taken as is, so symbols can be token kinds such as
+    'TOKEN_ID' (an empty list or ['ε'] is the empty body).
+    """
+    if isinstance(rule, str):
+        return [] if rule == EPSILON else list(rule)
+    return [sym for sym in rule if sym != EPSILON]
+
+
+def show_rule(rule: Rule) -> str:
+    return rule if isinstance(rule, str) else ' '.join(rule) or EPSILON
+
+
+def token_kind_ids(kinds: Iterable) -> Dict[str, int]:
+    """terminal_ids for a lexer's token kinds.
+
+    Enum members (lfa66.TokenType) keep their integer values; other kinds
+    (lfa3's string constants) are numbered in the order given.  Terminals are
+    named by the member name or the string itself.
+    """
+    return {kind.name if isinstance(kind, Enum) else kind: kind.value if isinstance(kind, Enum) else i
+            for i, kind in enumerate(kinds)}
+
+
+def compute_first(cfg) -> Dict[str, Set[str]]:
+    """FIRST sets of every non-terminal of a CFG (EPSILON marks nullable)."""
+    first = {nt: set() for nt in cfg.VN}
+    changed = True
+    while changed:
+        changed = False
+        for nt, rules in cfg.P.items():
+            for rule in rules:
+                new = first_of_sequence(rule_symbols(rule), first, cfg.VN)
+                if not new <= first[nt]:
+                    first[nt] |= new
+                    changed = True
+    return first
+
+
+def first_of_sequence(symbols: Iterable[str], first: Dict[str, Set[str]], non_terminals: Set[str]) -> Set[str]:
+    """FIRST set of a sequence of grammar symbols."""
+    result = set()
+    for sym in symbols:
+        if sym not in non_terminals:
+            result.add(sym)
+            return result
+        result |= first[sym] - {EPSILON}
+        if EPSILON not in first[sym]:
+            return result
+    result.add(EPSILON)
+    return result
+
+
+def compute_follow(cfg, first: Optional[Dict[str, Set[str]]] = None) -> Dict[str, Set[str]]:
+    """FOLLOW sets of every non-terminal of a CFG (END_MARKER marks end of input)."""
+    if first is None:
+        first = compute_first(cfg)
+    follow = {nt: set() for nt in cfg.VN}
+    follow[cfg.S].add(END_MARKER)
+    changed = True
+    while changed:
+        changed = False
+        for nt, rules in cfg.P.items():
+            for rule in rules:
+                symbols = rule_symbols(rule)
+                for i, sym in enumerate(symbols):
+                    if sym not in cfg.VN:
+                        continue
+                    rest = first_of_sequence(symbols[i + 1:], first, cfg.VN)
+                    new = rest - {EPSILON}
+                    if EPSILON in rest:
+                        new |= follow[nt]
+                    if not new <= follow[sym]:
+                        follow[sym] |= new
+                        changed = True
+    return follow
+
+
+class ParseTable:
+    """Common state of the table-driven parsers: numbered productions and token ids.
+
+    Terminals are addressed by integer token ids so that the lexers' ids can be
+    fed in directly.  By default terminals are numbered in sorted order and the
+    end of input gets the next free id.
+    """
+
+    def __init__(self, cfg, terminal_ids: Optional[Dict[str, int]] = None, eof_id: Optional[int] = None):
+        self.start_symbol = cfg.S
+        self.non_terminals = sorted(cfg.VN)
+        terminal_ids, eof_id = self._token_ids(cfg, terminal_ids, eof_id)
+        self.terminal_ids = terminal_ids
+        self.eof_id = eof_id
+        self.fingerprint = self._fingerprint(cfg, terminal_ids, eof_id)
+        self.width = max(list(self.terminal_ids.values()) + [eof_id]) + 1
+        self.nt_ids = {nt: i for i, nt in enumerate(self.non_terminals)}
+        self.productions: List[Tuple[str, Rule]] = [(nt, rule if isinstance(rule, str) else tuple(rule))
+                                                     for nt in self.non_terminals for rule in cfg.P.get(nt, [])]
+        self.conflicts: List[str] = []
+
+    @staticmethod
+    def _token_ids(cfg, terminal_ids, eof_id) -> Tuple[Dict[str, int], int]:
+        if terminal_ids is None:
+            terminal_ids = {t: i for i, t in enumerate(sorted(cfg.VT))}
+        if eof_id is None:
+            eof_id = max(terminal_ids.values(), default=-1) + 1
+        return dict(terminal_ids), eof_id
+
+    @classmethod
+    def _fingerprint(cls, cfg, terminal_ids: Dict[str, int], eof_id: int) -> str:
+        """Hash of everything the tables are built from: table kind, VN, VT, S, P and the token ids."""
+        key = (TABLE_FORMAT, cls.__name__, sorted(cfg.VN), sorted(cfg.VT), cfg.S,
+               [(nt, [rule if isinstance(rule, str) else tuple(rule) for rule in cfg.P[nt]]) for nt in sorted(cfg.P)],
+               sorted(terminal_ids.items()), eof_id)
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def token_id(self, terminal: str) -> int:
+        return self.eof_id if terminal == END_MARKER else self.terminal_ids[terminal]
+
+    def token_ids(self, tokens: Iterable[str]) -> List[int]:
+        """Translate terminal symbols into the integer ids the parser runs on."""
+        return [self.token_id(t) for t in tokens]
+
+    def lexer_token_ids(self, lexer) -> Iterator[int]:
+        """Token ids of a lexer's token stream (lfa66.Lexer, lfa3.Lexer), ending before its EOF token.
+
+        Token kinds are looked up by name, so the table must have been built
+        with token_kind_ids() of the lexer's kinds and eof_id set to the id of
+        its EOF kind.
+        """
+        terminal_ids, eof = self.terminal_ids, self.eof_id
+        while True:
+            token = lexer.get_next_token()
+            kind = token.type.name if isinstance(token.type, Enum) else token.type
+            if kind not in terminal_ids:
+                raise Exception(f"Token kind {kind} has no id in this table")
+            token_id = terminal_ids[kind]
+            if token_id == eof:
+                return
+            yield token_id
+
+    def save(self, path: str):
+        """Cache the generated tables on disk."""
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path: str, cfg, terminal_ids: Optional[Dict[str, int]] = None, eof_id: Optional[int] = None):
+        """Load tables previously written with save(), skipping the construction.
+
+        cfg, terminal_ids and eof_id are the arguments the tables would be
+        built with; a file written for anything else raises an Exception.
+        """
+        expected = cls._fingerprint(cfg, *cls._token_ids(cfg, terminal_ids, eof_id))
+        table = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            table.__dict__.update(pickle.load(f))
+        if table.__dict__.get('fingerprint') != expected:
+            raise Exception(f"{path} holds {cls.__name__} tables for a different grammar or token ids")
+        return table
+
+
+class LL1Table(ParseTable):
+    """LL(1) predictive parsing table built from FIRST/FOLLOW sets."""
+
+    def __init__(self, cfg, terminal_ids: Optional[Dict[str, int]] = None, eof_id: Optional[int] = None):
+        super().__init__(cfg, terminal_ids, eof_id)
+        first = compute_first(cfg)
+        follow = compute_follow(cfg, first)
+        self.table = [[ERROR] * self.width for _ in self.non_terminals]
+        # Production bodies as stacks of encoded symbols: terminals are token
+        # ids (>= 0), non-terminals are ~nt_id (< 0), pushed in reverse order.
+        self.bodies = []
+        for index, (nt, rule) in enumerate(self.productions):
+            symbols = rule_symbols(rule)
+            self.bodies.append([~self.nt_ids[s] if s in cfg.VN else self.token_id(s) for s in reversed(symbols)])
+            lookaheads = first_of_sequence(symbols, first, cfg.VN)
+            if EPSILON in lookaheads:
+                lookaheads = (lookaheads - {EPSILON}) | follow[nt]
+            row = self.table[self.nt_ids[nt]]
+            for terminal in lookaheads:
+                column = self.token_id(terminal)
+                if row[column] != ERROR and row[column] != index:
+                    other = self.productions[row[column]]
+                    self.conflicts.append(f"LL(1) conflict at ({nt}, {terminal}): "
+                                          f"{other[0]} → {show_rule(other[1])} / {nt} → {show_rule(rule)}")
+                    continue
+                row[column] = index
+
+    def parse(self, tokens: Iterable[int]) -> List[Tuple[str, Rule]]:
+        """Parse a sequence of token ids; returns the leftmost derivation."""
+        table, bodies, productions = self.table, self.bodies, self.productions
+        stream = iter(tokens)
+        eof = self.eof_id
+        lookahead = next(stream, eof)
+        stack = [~self.nt_ids[self.start_symbol]]
+        derivation = []
+        while stack:
+            top = stack.pop()
+            if top >= 0:
+                if top != lookahead:
+                    raise Exception(f"Unexpected token id {lookahead}, expected {top}")
+                lookahead = next(stream, eof)
+                continue
+            index = table[~top][lookahead] if 0 <= lookahead < self.width else ERROR
+            if index == ERROR:
+                raise Exception(f"Unexpected token id {lookahead} while expanding {self.non_terminals[~top]}")
+            derivation.append(productions[index])
+            stack.extend(bodies[index])
+        if lookahead != eof:
+            raise Exception(f"Unexpected token id {lookahead}, expected end of input")
+        return derivation
+
+
+class LALR1Table(ParseTable):
+    """LALR(1) action/goto tables built from the LR(0) automaton with propagated lookaheads.
+
+    Actions are encoded as integers: ``s + 1`` shifts to state s, ``-(p + 1)``
+    reduces by production p, ACCEPT accepts and 0 (with ERROR in goto) is an error.
+    """
+
+    ACCEPT = 1 << 30
+
+    def __init__(self, cfg, terminal_ids: Optional[Dict[str, int]] = None, eof_id: Optional[int] = None):
+        super().__init__(cfg, terminal_ids, eof_id)
+        first = compute_first(cfg)
+        augmented = len(self.productions)
+        bodies = [rule_symbols(rule) for _, rule in self.productions] + [[cfg.S]]
+        heads = [nt for nt, _ in self.productions] + [None]
+        by_head: Dict[str, List[int]] = {}
+        for index, (nt, _) in enumerate(self.productions):
+            by_head.setdefault(nt, []).append(index)
+
+        # LR(0) canonical collection; items are (production, dot).
+        def closure0(kernel):
+            items = set(kernel)
+            work = list(kernel)
+            while work:
+                p, dot = work.pop()
+                if dot < len(bodies[p]) and bodies[p][dot] in cfg.VN:
+                    for q in by_head.get(bodies[p][dot], []):
+                        if (q, 0) not in items:
+                            items.add((q, 0))
+                            work.append((q, 0))
+            return items
+
+        kernels = [frozenset([(augmented, 0)])]
+        state_of = {kernels[0]: 0}
+        transitions: List[Dict[str, int]] = []
+        i = 0
+        while i < len(kernels):
+            moves: Dict[str, Set[Tuple[int, int]]] = {}
+            for p, dot in closure0(kernels[i]):
+                if dot < len(bodies[p]):
+                    moves.setdefault(bodies[p][dot], set()).add((p, dot + 1))
+            transitions.append({})
+            for sym, kernel in moves.items():
+                kernel = frozenset(kernel)
+                if kernel not in state_of:
+                    state_of[kernel] = len(kernels)
+                    kernels.append(kernel)
+                transitions[i][sym] = state_of[kernel]
+            i += 1
+
+        # Propagate lookaheads over the LR(0) automaton until a fixpoint.
+        lookaheads = {(s, item): set() for s, kernel in enumerate(kernels) for item in kernel}
+        lookaheads[(0, (augmented, 0))].add(END_MARKER)
+
+        def closure1(state):
+            items = {item: set(lookaheads[(state, item)]) for item in kernels[state]}
+            work = list(items)
+            while work:
+                p, dot = work.pop()
+                if dot >= len(bodies[p]) or bodies[p][dot] not in cfg.VN:
+                    continue
+                rest = first_of_sequence(bodies[p][dot + 1:], first, cfg.VN)
+                new = rest - {EPSILON}
+                if EPSILON in rest:
+                    new |= items[(p, dot)]
+                for q in by_head.get(bodies[p][dot], []):
+                    current = items.setdefault((q, 0), set())
+                    if not new <= current:
+                        current |= new
+                        work.append((q, 0))
+            return items
+
+        changed = True
+        while changed:
+            changed = False
+            for s in range(len(kernels)):
+                for (p, dot), las in closure1(s).items():
+                    if dot < len(bodies[p]):
+                        target = lookaheads[(transitions[s][bodies[p][dot]], (p, dot + 1))]
+                        if not las <= target:
+                            target |= las
+                            changed = True
+
+        self.action = [[0] * self.width for _ in kernels]
+        self.goto = [[ERROR] * len(self.non_terminals) for _ in kernels]
+        self.lengths = [len(body) for body in bodies[:augmented]]
+        self.heads = [self.nt_ids[nt] for nt in heads[:augmented]]
+        for s in range(len(kernels)):
+            for sym, target in transitions[s].items():
+                if sym in cfg.VN:
+                    self.goto[s][self.nt_ids[sym]] = target
+                else:
+                    self._set_action(s, sym, target + 1)
+            for (p, dot), las in closure1(s).items():
+                if dot < len(bodies[p]):
+                    continue
+                for terminal in las:
+                    self._set_action(s, terminal, self.ACCEPT if p == augmented else -(p + 1))
+
+    def _describe(self, action: int) -> str:
+        if action == self.ACCEPT:
+            return "accept"
+        if action > 0:
+            return f"shift {action - 1}"
+        nt, rule = self.productions[-action - 1]
+        return f"reduce {nt} → {show_rule(rule)}"
+
+    def _set_action(self, state: int, terminal: str, action: int):
+        row = self.action[state]
+        column = self.token_id(terminal)
+        if row[column] not in (0, action):
+            kind = "shift/reduce" if row[column] > 0 or action > 0 else "reduce/reduce"
+            self.conflicts.append(f"LALR(1) {kind} conflict in state {state} on {terminal}: "
+                                  f"{self._describe(row[column])} / {self._describe(action)}")
+            return
+        row[column] = action
+
+    def parse(self, tokens: Iterable[int]) -> List[Tuple[str, Rule]]:
+        """Parse a sequence of token ids; returns the reductions (a reversed rightmost derivation)."""
+        action, goto, lengths, heads, productions = self.action, self.goto, self.lengths, self.heads, self.productions
+        accept = self.ACCEPT
+        stream = iter(tokens)
+        eof = self.eof_id
+        lookahead = next(stream, eof)
+        stack = [0]
+        reductions = []
+        while True:
+            act = action[stack[-1]][lookahead] if 0 <= lookahead < self.width else 0
+            if act == accept:
+                return reductions
+            if act > 0:
+                stack.append(act - 1)
+                lookahead = next(stream, eof)
+            elif act < 0:
+                p = -act - 1
+                if lengths[p]:
+                    del stack[-lengths[p]:]
+                stack.append(goto[stack[-1]][heads[p]])
+                reductions.append(productions[p])
+            else:
+                raise Exception(f"Unexpected token id {lookahead} in state {stack[-1]}")
+
+
+def main():
+    from .lfa55 import CFG
+
+    # E → E+T | T, T → T*F | F, F → (E) | i
+    expr = CFG({'E', 'T', 'F'}, {'+', '*', '(', ')', 'i'}, 'E',
+               {'E': ['E+T', 'T'], 'T': ['T*F', 'F'], 'F': ['(E)', 'i']})
+    lalr = LALR1Table(expr)
+    print("LALR(1) conflicts:", lalr.conflicts)
+    print("LALR(1) reductions:", lalr.parse(lalr.token_ids("i+i*i")))
+
+    # Same language without left recursion: E → TX, X → +TX | ε, T → FY, Y → *FY | ε, F → (E) | i
+    expr_ll = CFG({'E', 'X', 'T', 'Y', 'F'}, {'+', '*', '(', ')', 'i'}, 'E',
+                  {'E': ['TX'], 'X': ['+TX', 'ε'], 'T': ['FY'], 'Y': ['*FY', 'ε'], 'F': ['(E)', 'i']})
+    first = compute_first(expr_ll)
+    print("FIRST:", first)
+    print("FOLLOW:", compute_follow(expr_ll, first))
+    ll = LL1Table(expr_ll)
+    print("LL(1) conflicts:", ll.conflicts)
+    print("LL(1) derivation:", ll.parse(ll.token_ids("(i+i)*i")))
+    print("LL(1) conflicts on the left-recursive grammar:", LL1Table(expr).conflicts)
+
+    # Assignments over lfa66's token kinds, parsed straight from its lexer's token ids.
+    from .lfa66 import Lexer, TokenType
+    statements = CFG({'Program', 'Stmt', 'Expr', 'Term', 'Factor'},
+                     {'TOKEN_ID', 'TOKEN_NUMBER', 'TOKEN_EQUALS', 'TOKEN_SEMI', 'TOKEN_PLUS', 'TOKEN_MINUS',
+                      'TOKEN_MULTIPLY', 'TOKEN_DIVIDE', 'TOKEN_LPAREN', 'TOKEN_RPAREN'}, 'Program',
+                     {'Program': [['Stmt', 'Program'], []],
+                      'Stmt': [['TOKEN_ID', 'TOKEN_EQUALS', 'Expr', 'TOKEN_SEMI']],
+                      'Expr': [['Expr', 'TOKEN_PLUS', 'Term'], ['Expr', 'TOKEN_MINUS', 'Term'], ['Term']],
+                      'Term': [['Term', 'TOKEN_MULTIPLY', 'Factor'], ['Term', 'TOKEN_DIVIDE', 'Factor'], ['Factor']],
+                      'Factor': [['TOKEN_LPAREN', 'Expr', 'TOKEN_RPAREN'], ['TOKEN_ID'], ['TOKEN_NUMBER']]})
+    lalr = LALR1Table(statements, token_kind_ids(TokenType), TokenType.TOKEN_EOF.value)
+    source = "x = (y + 2) * z; w = x / 4;"
+    print("LALR(1) conflicts on lfa66 tokens:", lalr.conflicts)
+    print(f"Reductions for {source!r}:")
+    for nt, rule in lalr.parse(lalr.lexer_token_ids(Lexer(source))):
+        print(f"  {nt} → {show_rule(rule)}")
+
+
+if __name__ == "__main__":
+    main()
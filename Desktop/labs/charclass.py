@@ -0,0 +1,240 @@
+"""Character-class (interval) labels for automata over large alphabets.
+
+A CharClass is a set of code points stored as sorted, disjoint, inclusive
+intervals, so a class like "any Unicode digit" costs a few dozen pairs
+instead of one transition per character.  CharClass objects can be used as
+transition symbols of an asl2.FiniteAutomaton (or as the symbol half of a
+finite_automaton.FiniteAutomaton key); ClassDFA then splits all labels into
+their minimal set of equivalence classes, determinizes and minimizes over
+the class ids, and matches through a byte -> class lookup table.  Only
+ClassDFA interprets such labels: the automaton's own accepts(), as_dfa()
+and everything built on them raise instead of treating overlapping
+classes as unrelated symbols.
+"""
+from array import array
+from bisect import bisect_right
+
+from .asl2 import EPSILON, FiniteAutomaton
+
+MAX_CODE_POINT = 0x10FFFF
+
+
+class CharClass:
+    """Immutable set of code points as sorted, merged (first, last) intervals."""
+
+    __slots__ = ("intervals",)
+
+    def __init__(self, intervals=()):
+        merged = []
+        for first, last in sorted(intervals):
+            if merged and first <= merged[-1][1] + 1:
+                if last > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+        self.intervals = tuple(merged)
+
+    @classmethod
+    def of(cls, chars):
+        """Class of the given characters."""
+        return cls((ord(char), ord(char)) for char in chars)
+
+    @classmethod
+    def range(cls, first, last):
+        """Class of the characters first..last inclusive."""
+        return cls([(ord(first), ord(last))])
+
+    @classmethod
+    def from_predicate(cls, predicate, limit=MAX_CODE_POINT + 1):
+        """Class of the characters below `limit` satisfying predicate, e.g. str.isalnum."""
+        intervals = []
+        start = None
+        for code in range(limit):
+            if predicate(chr(code)):
+                if start is None:
+                    start = code
+            elif start is not None:
+                intervals.append((start, code - 1))
+                start = None
+        if start is not None:
+            intervals.append((start, limit - 1))
+        return cls(intervals)
+
+    def __contains__(self, char):
+        code = ord(char)
+        index = bisect_right(self.intervals, (code, MAX_CODE_POINT + 1)) - 1
+        return index >= 0 and self.intervals[index][1] >= code
+
+    def __or__(self, other):
+        return CharClass(self.intervals + other.intervals)
+
+    def __invert__(self):
+        gaps = []
+        previous = -1
+        for first, last in self.intervals:
+            if first > previous + 1:
+                gaps.append((previous + 1, first - 1))
+            previous = last
+        if previous < MAX_CODE_POINT:
+            gaps.append((previous + 1, MAX_CODE_POINT))
+        return CharClass(gaps)
+
+    def __and__(self, other):
+        return ~(~self | ~other)
+
+    def __sub__(self, other):
+        return self & ~other
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __eq__(self, other):
+        return isinstance(other, CharClass) and self.intervals == other.intervals
+
+    def __lt__(self, other):
+        return self.intervals < other.intervals
+
+    def __hash__(self):
+        return hash(self.intervals)
+
+    def __repr__(self):
+        def show(code):
+            char = chr(code)
+            return char if char.isprintable() and char not in "-[]\\" else f"\\u{code:04x}"
+        parts = [show(first) if first == last else f"{show(first)}-{show(last)}" for first, last in self.intervals]
+        return f"[{''.join(parts)}]"
+
+
+DIGIT = CharClass.range('0', '9')
+ALPHA = CharClass.range('a', 'z') | CharClass.range('A', 'Z')
+ALNUM = ALPHA | DIGIT
+SPACE = CharClass.of(" \t\n\r\f\v")
+ANY = CharClass([(0, MAX_CODE_POINT)])
+
+
+def as_char_class(symbol):
+    """A CharClass label as is, a single-character label as its one-character class."""
+    if isinstance(symbol, CharClass):
+        return symbol
+    if not isinstance(symbol, str) or len(symbol) != 1:
+        raise Exception(f"Label {symbol!r} is neither a single character nor a CharClass")
+    return CharClass.of(symbol)
+
+
+class AlphabetPartition:
+    """Coarsest partition of the code points that every given class is a union of.
+
+    Class id 0 collects the code points covered by no label.  members[i]
+    lists the class ids making up the i-th input class, and byte_table maps
+    every code point below 256 straight to its class id.
+    """
+
+    def __init__(self, classes):
+        points = {0, MAX_CODE_POINT + 1}
+        for char_class in classes:
+            for first, last in char_class.intervals:
+                points.update((first, last + 1))
+        points = sorted(points)
+        covering = [[] for _ in range(len(points) - 1)]
+        for index, char_class in enumerate(classes):
+            for first, last in char_class.intervals:
+                for segment in range(bisect_right(points, first) - 1, bisect_right(points, last)):
+                    covering[segment].append(index)
+
+        ids = {(): 0}
+        self.starts, self.segment_class = [], []
+        for start, labels in zip(points, covering):
+            class_id = ids.setdefault(tuple(labels), len(ids))
+            if not self.segment_class or self.segment_class[-1] != class_id:
+                self.starts.append(start)
+                self.segment_class.append(class_id)
+        self.count = len(ids)
+        self.members = [[] for _ in classes]
+        for labels, class_id in ids.items():
+            for index in labels:
+                self.members[index].append(class_id)
+        if self.count <= 256:
+            self.byte_table = bytes(self.class_of(code) for code in range(256))
+        else:
+            self.byte_table = None
+
+    def class_of(self, code):
+        return self.segment_class[bisect_right(self.starts, code) - 1]
+
+    def classify(self, text):
+        """Class ids of the characters of text (a bytes object when they fit in one)."""
+        if self.byte_table is not None:
+            try:
+                return text.encode('latin-1').translate(self.byte_table)
+            except UnicodeEncodeError:
+                pass
+        class_of = self.class_of
+        return [class_of(ord(char)) for char in text]
+
+
+class ClassDFA:
+    """Minimal DFA over the equivalence classes of an automaton's CharClass labels.
+
+    Transitions live in one flat array indexed by state * classes + class id
+    (-1 is the dead state), whose size depends on the number of classes, not
+    on the size of the alphabet.
+    """
+
+    def __init__(self, fa):
+        if hasattr(fa, 'accept_states'):
+            transitions = {}
+            for (state, symbol), target in fa.transitions.items():
+                transitions.setdefault(state, {}).setdefault(symbol, set()).add(target)
+            fa = FiniteAutomaton(set(fa.states), set(fa.alphabet), transitions, fa.start_state, set(fa.accept_states))
+
+        labels = sorted({symbol for paths in fa.transitions.values() for symbol in paths if symbol != EPSILON},
+                        key=lambda symbol: as_char_class(symbol).intervals)
+        self.partition = AlphabetPartition([as_char_class(symbol) for symbol in labels])
+        members = dict(zip(labels, self.partition.members))
+
+        transitions = {}
+        for state, paths in fa.transitions.items():
+            expanded = transitions.setdefault(state, {})
+            for symbol, next_states in paths.items():
+                for class_id in ([EPSILON] if symbol == EPSILON else members[symbol]):
+                    expanded.setdefault(class_id, set()).update(next_states)
+        nfa = FiniteAutomaton(set(fa.states), set(range(self.partition.count)), transitions,
+                              fa.start_state, set(fa.final_states))
+        dfa = nfa.minimize()
+
+        index = {name: int(name[1:]) for name in dfa.states}
+        self.classes = self.partition.count
+        self.table = array('i', [-1]) * (len(index) * self.classes)
+        for name, paths in dfa.transitions.items():
+            for class_id, next_states in paths.items():
+                for next_state in next_states:
+                    self.table[index[name] * self.classes + class_id] = index[next_state]
+        self.accepting = bytes(1 if f"q{i}" in dfa.final_states else 0 for i in range(len(index)))
+
+    def accepts(self, text):
+        table, classes = self.table, self.classes
+        state = 0
+        for class_id in self.partition.classify(text):
+            state = table[state * classes + class_id]
+            if state < 0:
+                return False
+        return bool(self.accepting[state])
+
+
+def main():
+    # Identifiers and numbers as the lexers recognise them: [A-Za-z][A-Za-z0-9]* | [0-9.]+
+    transitions = {
+        "start": {ALPHA: {"id"}, DIGIT | CharClass.of("."): {"num"}},
+        "id": {ALNUM: {"id"}},
+        "num": {DIGIT | CharClass.of("."): {"num"}},
+    }
+    fa = FiniteAutomaton({"start", "id", "num"}, set(), transitions, "start", {"id", "num"})
+    dfa = ClassDFA(fa)
+    print("Equivalence classes:", dfa.classes)
+    print("Transition table entries:", len(dfa.table))
+    for text in ["while", "x1", "3.14", "1x", "", "é"]:
+        print(f"{text!r} accepted:", dfa.accepts(text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Cardinality, enumeration and shortest-witness queries on regular languages.
+
+language(x) accepts an asl2.FiniteAutomaton, a finite_automaton
+FiniteAutomaton or Grammar (through its to_finite_automaton()) and returns
+a Language built on the minimal DFA.  The Language, and with it every DP
+table it has filled, is cached per object: for asl2 automata in their
+cache dict, which is cleared whenever the transitions change.
+"""
+import weakref
+from collections import deque
+
+from .asl2 import FiniteAutomaton
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def language(obj):
+    """Cached Language of an automaton or regular grammar."""
+    cache = getattr(obj, 'cache', None)
+    if cache is None:
+        cache = _caches.setdefault(obj, {})
+    if 'language' not in cache:
+        cache['language'] = Language(obj)
+    return cache['language']
+
+
+def _mat_mul(a, b, modulus):
+    size = len(b[0])
+    result = []
+    for row in a:
+        out = [0] * size
+        for k, value in enumerate(row):
+            if value:
+                for j, other in enumerate(b[k]):
+                    if other:
+                        out[j] += value * other
+        result.append([x % modulus for x in out] if modulus else out)
+    return result
+
+
+def _mat_pow(matrix, power, modulus):
+    result = [[int(i == j) for j in range(len(matrix))] for i in range(len(matrix))]
+    while power:
+        if power & 1:
+            result = _mat_mul(result, matrix, modulus)
+        matrix = _mat_mul(matrix, matrix, modulus)
+        power >>= 1
+    return result
+
+
+class Language:
+    """Queries over the minimal DFA of a regular language (states 0..n-1, start 0)."""
+
+    def __init__(self, obj):
+        if hasattr(obj, 'to_finite_automaton'):
+            obj = obj.to_finite_automaton()
+        if hasattr(obj, 'accept_states'):
+            transitions = {}
+            for (state, symbol), target in obj.transitions.items():
+                transitions.setdefault(state, {}).setdefault(symbol, set()).add(target)
+            obj = FiniteAutomaton(set(obj.states), set(obj.alphabet), transitions,
+                                  obj.start_state, set(obj.accept_states))
+        dfa = obj.minimize()
+        index = {f"q{i}": i for i in range(len(dfa.states))}
+        self.size = len(index)
+        # Outgoing edges per state, sorted by symbol so walks come out in lexicographic order.
+        self.edges = [sorted((symbol, index[next(iter(targets))])
+                             for symbol, targets in dfa.transitions[f"q{i}"].items() if targets)
+                      for i in range(self.size)]
+        self.accepting = [f"q{i}" in dfa.final_states for i in range(self.size)]
+        # rows[r][state]: number of accepted strings of length exactly r read from state.
+        self.rows = [[int(accepting) for accepting in self.accepting]]
+        self._matrix = None
+
+    def _row(self, length):
+        rows = self.rows
+        while len(rows) <= length:
+            previous = rows[-1]
+            rows.append([sum(previous[target] for _, target in edges) for edges in self.edges])
+        return rows[length]
+
+    def is_empty(self):
+        return not any(self.accepting)
+
+    def is_finite(self):
+        """True if the language has finitely many strings (the minimal DFA has no live cycle)."""
+        return self.is_empty() or self.longest_length() is not None
+
+    def longest_length(self):
+        """Length of the longest accepted string, or None for an infinite or empty language."""
+        # Every state of the minimal DFA is live, so any cycle means infinitely many strings.
+        order, state_of_visit = [], {}
+        for root in range(self.size):
+            if root in state_of_visit:
+                continue
+            stack = [(root, iter(self.edges[root]))]
+            state_of_visit[root] = 'open'
+            while stack:
+                state, successors = stack[-1]
+                for _, target in successors:
+                    if state_of_visit.get(target) == 'open':
+                        return None
+                    if target not in state_of_visit:
+                        state_of_visit[target] = 'open'
+                        stack.append((target, iter(self.edges[target])))
+                        break
+                else:
+                    state_of_visit[state] = 'done'
+                    order.append(state)
+                    stack.pop()
+        longest = {}
+        for state in order:
+            lengths = [longest[target] + 1 for _, target in self.edges[state] if longest[target] is not None]
+            own = 0 if self.accepting[state] else None
+            longest[state] = max(lengths + ([own] if own is not None else []), default=None)
+        return longest[0]
+
+    def count(self, length, modulus=None):
+        """Number of accepted strings of exactly `length` symbols (optionally mod `modulus`)."""
+        if modulus is None and length <= max(len(self.rows), 1024):
+            return self._row(length)[0]
+        power = _mat_pow(self._transition_matrix(), length, modulus)
+        total = sum(count for count, accepting in zip(power[0], self.accepting) if accepting)
+        return total % modulus if modulus else total
+
+    def count_up_to(self, length, modulus=None):
+        """Number of accepted strings of at most `length` symbols, by matrix exponentiation.
+
+        Uses the (n+1)x(n+1) matrix [[M, f], [0, 1]], whose powers carry the
+        running sum of accepted strings in the extra column.
+        """
+        matrix = [row + [int(accepting)] for row, accepting in zip(self._transition_matrix(), self.accepting)]
+        matrix.append([0] * self.size + [1])
+        power = _mat_pow(matrix, length + 1, modulus)
+        return power[0][self.size]
+
+    def _transition_matrix(self):
+        if self._matrix is None:
+            self._matrix = [[0] * self.size for _ in range(self.size)]
+            for state, edges in enumerate(self.edges):
+                for _, target in edges:
+                    self._matrix[state][target] += 1
+        return self._matrix
+
+    def strings(self, max_length=None):
+        """Accepted strings in shortlex order (by length, then lexicographically), lazily.
+
+        Without max_length an infinite language is streamed forever; a finite
+        one stops after its longest string.
+        """
+        if self.is_empty():
+            return
+        if max_length is None:
+            max_length = self.longest_length()
+        length = 0
+        while max_length is None or length <= max_length:
+            if self._row(length)[0]:
+                yield from self._walk(length)
+            length += 1
+
+    def _walk(self, length):
+        """Accepted strings of exactly `length` symbols in lexicographic order, pruned by the DP rows."""
+        self._row(length)
+        rows = self.rows
+        if length == 0:
+            if self.accepting[0]:
+                yield ''
+            return
+        prefix = []
+        stack = [(0, length, iter(self.edges[0]))]
+        while stack:
+            state, remaining, edges = stack[-1]
+            for symbol, target in edges:
+                if rows[remaining - 1][target]:
+                    prefix.append(symbol)
+                    if remaining == 1:
+                        yield ''.join(prefix)
+                        prefix.pop()
+                        continue
+                    stack.append((target, remaining - 1, iter(self.edges[target])))
+                    break
+            else:
+                stack.pop()
+                if prefix:
+                    prefix.pop()
+
+    def shortest(self, k=1):
+        """The k shortest accepted strings (shortlex order); fewer if the language is smaller."""
+        result = []
+        for string in self.strings():
+            if len(result) == k:
+                break
+            result.append(string)
+        return result
+
+    def shortest_witness(self):
+        """Shortest (then lexicographically first) accepted string by BFS, or None if empty."""
+        parents = {0: None}
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            if self.accepting[state]:
+                symbols = []
+                while parents[state] is not None:
+                    state, symbol = parents[state]
+                    symbols.append(symbol)
+                return ''.join(reversed(symbols))
+            for symbol, target in self.edges[state]:
+                if target not in parents:
+                    parents[target] = (state, symbol)
+                    queue.append(target)
+        return None
+
+
+def main():
+    from .scanner import regex_to_automaton
+
+    for regex in ["(a|b)(c|d)E+G?", "1(0|1)*2(3|4)5"]:
+        lang = language(regex_to_automaton(regex))
+        print(f"Regex: {regex}")
+        print(f"  shortest witness: {lang.shortest_witness()!r}, 5 shortest: {lang.shortest(5)}")
+        print(f"  strings of length <= 10: {lang.count_up_to(10)}, "
+              f"<= 10**6 (mod 10**9 + 7): {lang.count_up_to(10 ** 6, modulus=10 ** 9 + 7)}")
+
+
+if __name__ == "__main__":
+    main()
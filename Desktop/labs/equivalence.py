@@ -0,0 +1,134 @@
+from collections import deque
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from .asl2 import EPSILON, check_plain_symbols
+
+
+class _View:
+    """Uniform read-only view over both FiniteAutomaton flavours.
+
+    finite_automaton.FiniteAutomaton keys transitions by (state, symbol) and
+    names its finals accept_states; asl2.FiniteAutomaton maps state -> symbol
+    -> set of states and names them final_states, and may carry ε-edges,
+    which are folded into the successors here through its cached closures.
+    """
+
+    def __init__(self, fa):
+        self.alphabet = set(fa.alphabet)
+        if hasattr(fa, 'accept_states'):
+            self.finals = set(fa.accept_states)
+            self.successors = {}
+            check_plain_symbols(symbol for _, symbol in fa.transitions)
+            for (state, symbol), target in fa.transitions.items():
+                self.successors.setdefault(state, {})[symbol] = {target}
+            self.start = frozenset([fa.start_state])
+        else:
+            self.finals = set(fa.final_states)
+            self.successors = fa.transitions
+            if fa.has_epsilon_transitions():
+                self.successors = {
+                    state: {symbol: fa.epsilon_closure(next_states) for symbol, next_states in paths.items()
+                            if symbol != EPSILON}
+                    for state, paths in fa.transitions.items()
+                }
+            self.start = frozenset(fa.epsilon_closure([fa.start_state]))
+        self._cache: Dict[Tuple[FrozenSet, str], FrozenSet] = {}
+
+    def accepting(self, macro: FrozenSet) -> bool:
+        return not self.finals.isdisjoint(macro)
+
+    def step(self, macro: FrozenSet, symbol: str) -> FrozenSet:
+        """Subset-construction successor, memoized per (macrostate, symbol)."""
+        key = (macro, symbol)
+        target = self._cache.get(key)
+        if target is None:
+            target = set()
+            for state in macro:
+                target |= self.successors.get(state, {}).get(symbol, set())
+            target = self._cache[key] = frozenset(target)
+        return target
+
+
+def _word(parents, node) -> str:
+    symbols = []
+    while parents[node] is not None:
+        node, symbol = parents[node]
+        symbols.append(symbol)
+    return ''.join(reversed(symbols))
+
+
+def equivalent(a, b) -> Tuple[bool, Optional[str]]:
+    """Check L(a) == L(b) with Hopcroft-Karp union-find.
+
+    NFAs are determinized on the fly.  Pairs are explored breadth-first, so a
+    shortest string accepted by exactly one automaton is returned alongside
+    False; the result is (True, None) when the languages are equal.
+    """
+    left, right = _View(a), _View(b)
+    alphabet = sorted(left.alphabet | right.alphabet)
+    parent = {}
+
+    def find(node):
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    start = (left.start, right.start)
+    parents = {start: None}
+    queue = deque([start])
+    parent[('a', left.start)] = ('b', right.start)
+    while queue:
+        pair = queue.popleft()
+        p, q = pair
+        if left.accepting(p) != right.accepting(q):
+            return False, _word(parents, pair)
+        for symbol in alphabet:
+            p2, q2 = left.step(p, symbol), right.step(q, symbol)
+            root_p, root_q = find(('a', p2)), find(('b', q2))
+            if root_p == root_q:
+                continue
+            parent[root_p] = root_q
+            parents[(p2, q2)] = (pair, symbol)
+            queue.append((p2, q2))
+    return True, None
+
+
+def included(a, b) -> Tuple[bool, Optional[str]]:
+    """Check L(a) <= L(b) with an antichain search.
+
+    Explores pairs (state of a, macrostate of b) breadth-first and prunes any
+    pair subsumed by a visited one with the same a-state and a smaller
+    macrostate.  Returns (False, w) with a shortest w in L(a) - L(b), or
+    (True, None).
+    """
+    left, right = _View(a), _View(b)
+    alphabet = sorted(left.alphabet | right.alphabet)
+    antichain: Dict[object, list] = {}
+
+    def subsumed(state, macro):
+        return any(seen <= macro for seen in antichain.get(state, ()))
+
+    parents = {}
+    queue = deque()
+    for state in left.start:
+        node = (state, right.start)
+        parents[node] = None
+        antichain.setdefault(state, []).append(right.start)
+        queue.append(node)
+    while queue:
+        node = queue.popleft()
+        state, macro = node
+        if state in left.finals and not right.accepting(macro):
+            return False, _word(parents, node)
+        for symbol in alphabet:
+            macro2 = right.step(macro, symbol)
+            for state2 in left.successors.get(state, {}).get(symbol, ()):
+                if subsumed(state2, macro2):
+                    continue
+                antichain[state2] = [seen for seen in antichain.get(state2, []) if not macro2 <= seen] + [macro2]
+                parents[(state2, macro2)] = (node, symbol)
+                queue.append((state2, macro2))
+    return True, None
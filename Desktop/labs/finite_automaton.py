@@ -57,14 +57,20 @@ class FiniteAutomaton:
                 return False
         return current_state in self.accept_states
 
-grammar = Grammar()
-generated_strings = grammar.generate_multiple_strings()
-print("Generated Strings:", generated_strings)
-fa = grammar.to_finite_automaton()
 
-for generated_string in generated_strings:
-    print(f"String '{generated_string}' belongs to language:", fa.string_belongs_to_language(generated_string))
+def main():
+    grammar = Grammar()
+    generated_strings = grammar.generate_multiple_strings()
+    print("Generated Strings:", generated_strings)
+    fa = grammar.to_finite_automaton()
 
-more_tests = ["acda", "bd", "acd", "acddb"] 
-for test_string in more_tests:
-    print(f"String '{test_string}' belongs to language:", fa.string_belongs_to_language(test_string))
+    for generated_string in generated_strings:
+        print(f"String '{generated_string}' belongs to language:", fa.string_belongs_to_language(generated_string))
+
+    more_tests = ["acda", "bd", "acd", "acddb"] 
+    for test_string in more_tests:
+        print(f"String '{test_string}' belongs to language:", fa.string_belongs_to_language(test_string))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Optional hot-path counters for the automata, lexers and parser.
+
+Nothing is measured until enable() is called: it swaps instrumented
+versions of the hot methods into the classes, and disable() puts the
+originals back, so the uninstrumented code path pays nothing at all.
+
+    from labs import instrumentation
+    instrumentation.enable()
+    ...
+    print(instrumentation.metrics.to_prometheus())
+
+Automaton metrics are labelled per instance: by the automaton's `name`
+attribute when it has one (fa.name = "lab2"), otherwise by its class and
+a number assigned on first use.
+"""
+import importlib
+import itertools
+import time
+import weakref
+from collections import Counter, defaultdict
+
+PREFIX = "labs"
+
+
+class Metrics:
+    """Counters keyed by metric name and a sorted tuple of label pairs."""
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+
+    def add(self, name, value=1, **labels):
+        self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def add_counts(self, name, counts, label_names, **labels):
+        """Merge a Counter whose keys are label values (a tuple when several)."""
+        for key, value in counts.items():
+            values = key if isinstance(key, tuple) else (key,)
+            self.add(name, value, **labels, **dict(zip(label_names, map(str, values))))
+
+    def reset(self):
+        self.counters.clear()
+
+    def snapshot(self):
+        """Plain dict {metric: [{"labels": {...}, "value": v}, ...]} plus derived lexer rates."""
+        result = defaultdict(list)
+        for (name, labels), value in sorted(self.counters.items()):
+            result[name].append({"labels": dict(labels), "value": value})
+        for entry in result.get("lexer_seconds_total", []):
+            lexer_bytes = self.counters.get(("lexer_bytes_total", tuple(entry["labels"].items())), 0)
+            if entry["value"]:
+                result["lexer_bytes_per_second"].append(
+                    {"labels": entry["labels"], "value": lexer_bytes / entry["value"]})
+        return dict(result)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (every metric is a counter)."""
+        lines = []
+        by_name = defaultdict(list)
+        for (name, labels), value in sorted(self.counters.items()):
+            by_name[name].append((labels, value))
+        for name, samples in by_name.items():
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for labels, value in samples:
+                rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{PREFIX}_{name}{{{rendered}}} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _format(value):
+    """Integers exactly, everything else at full float precision."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+metrics = Metrics()
+_originals = {}
+_instance_names = weakref.WeakKeyDictionary()
+_instance_numbers = itertools.count()
+
+
+def automaton_name(fa):
+    """The `automaton` label of an instance: its `name` attribute if set, else class name and a per-instance number."""
+    name = getattr(fa, "name", None)
+    if name is None:
+        name = _instance_names.get(fa)
+        if name is None:
+            cls = type(fa)
+            name = _instance_names[fa] = f"{cls.__module__}.{cls.__name__}#{next(_instance_numbers)}"
+    return name
+
+
+def _patch(cls, attribute, replacement):
+    _originals.setdefault((cls, attribute), cls.__dict__[attribute])
+    setattr(cls, attribute, replacement)
+
+
+def _instrument_dict_fa(cls, registry):
+    """finite_automaton.FiniteAutomaton: transitions keyed by (state, symbol)."""
+
+    def string_belongs_to_language(self, input_string):
+        visits, hits = Counter(), Counter()
+        current_state = self.start_state
+        visits[current_state] += 1
+        result = None
+        for symbol in input_string:
+            if (current_state, symbol) in self.transitions:
+                hits[(current_state, symbol)] += 1
+                current_state = self.transitions[(current_state, symbol)]
+                visits[current_state] += 1
+            else:
+                result = False
+                break
+        if result is None:
+            result = current_state in self.accept_states
+        automaton = automaton_name(self)
+        registry.add_counts("fa_state_visits_total", visits, ("state",), automaton=automaton)
+        registry.add_counts("fa_transition_hits_total", hits, ("state", "symbol"), automaton=automaton)
+        return result
+
+    _patch(cls, "string_belongs_to_language", string_belongs_to_language)
+
+
+def _instrument_nfa(cls, registry):
+    """asl2.FiniteAutomaton: every active state of the bitset simulation counts as visited.
+
+    The original accepts() runs unchanged; while it does, _step() records
+    the masks it computes into the instance's trace.
+    """
+    accepts, step = cls.__dict__["accepts"], cls.__dict__["_step"]
+
+    def traced_step(self, mask, symbol):
+        result = step(self, mask, symbol)
+        trace = self.__dict__.get("_trace")
+        if trace is not None:
+            visits, hits = trace
+            for state in self._states_of(mask):
+                if self.transitions.get(state, {}).get(symbol):
+                    hits[(state, symbol)] += 1
+            visits.update(self._states_of(result))
+        return result
+
+    def instrumented_accepts(self, input_string):
+        visits, hits = Counter(), Counter()
+        self._trace = (visits, hits)
+        try:
+            result = accepts(self, input_string)
+        finally:
+            del self._trace
+        visits.update(self._states_of(self._mask([self.start_state])))
+        automaton = automaton_name(self)
+        registry.add_counts("fa_state_visits_total", visits, ("state",), automaton=automaton)
+        registry.add_counts("fa_transition_hits_total", hits, ("state", "symbol"), automaton=automaton)
+        return result
+
+    _patch(cls, "_step", traced_step)
+    _patch(cls, "accepts", instrumented_accepts)
+
+
+def _instrument_lexer(cls, registry, lexer, text, offset):
+    """Token counts per type plus UTF-8 bytes consumed and time spent in get_next_token.
+
+    offset(self) is the number of characters of self.<text> consumed so far.
+    """
+    get_next_token = cls.__dict__["get_next_token"]
+
+    def instrumented(self):
+        start_offset = offset(self)
+        start = time.perf_counter()
+        token = get_next_token(self)
+        registry.add("lexer_seconds_total", time.perf_counter() - start, lexer=lexer)
+        consumed = getattr(self, text)[start_offset:offset(self)]
+        registry.add("lexer_bytes_total", len(consumed.encode("utf-8", "surrogatepass")), lexer=lexer)
+        registry.add("lexer_tokens_total", 1, lexer=lexer, type=getattr(token.type, "name", token.type))
+        return token
+
+    _patch(cls, "get_next_token", instrumented)
+
+
+def _instrument_parser(cls, registry, parser):
+    """Call counts and inclusive time of every grammar rule method (parse_*, produce_ast)."""
+    for attribute, method in list(vars(cls).items()):
+        if not callable(method) or not (attribute.startswith("parse_") or attribute == "produce_ast"):
+            continue
+
+        def instrumented(self, *args, _method=method, _rule=attribute, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(self, *args, **kwargs)
+            finally:
+                registry.add("parser_rule_seconds_total", time.perf_counter() - start, parser=parser, rule=_rule)
+                registry.add("parser_rule_calls_total", 1, parser=parser, rule=_rule)
+
+        _patch(cls, attribute, instrumented)
+
+
+def enable(registry=None):
+    """Install the instrumented hot paths, recording into `registry` (default: metrics)."""
+    registry = metrics if registry is None else registry
+    disable()
+    package = __name__.rpartition(".")[0]
+    prefix = f"{package}." if package else ""
+    asl2 = importlib.import_module(f"{prefix}asl2")
+    lfa3 = importlib.import_module(f"{prefix}lfa3")
+    lfa66 = importlib.import_module(f"{prefix}lfa66")
+    _instrument_nfa(asl2.FiniteAutomaton, registry)
+    _instrument_lexer(lfa3.Lexer, registry, "lfa3", "text", lambda lexer: lexer.pos)
+    # lfa66's Lexer.i stops at the last character; c == '\0' means everything was read.
+    _instrument_lexer(lfa66.Lexer, registry, "lfa66", "contents",
+                      lambda lexer: len(lexer.contents) if lexer.c == '\0' else lexer.i)
+    _instrument_parser(lfa66.Parser, registry, "lfa66")
+    _instrument_dict_fa(importlib.import_module(f"{prefix}finite_automaton").FiniteAutomaton, registry)
+    return registry
+
+
+def disable():
+    """Restore every original method."""
+    for (cls, attribute), original in _originals.items():
+        setattr(cls, attribute, original)
+    _originals.clear()
@@ -1,5 +1,3 @@
-import re
-
 TOKEN_INT = "INT"
 TOKEN_FLOAT = "FLOAT"
 TOKEN_ID = "ID"
@@ -132,10 +130,14 @@ class Lexer:
             raise Exception(f"Illegal character {self.current_char}")
         return Token(TOKEN_EOF, None)
 
-if __name__ == "__main__":
+def main():
     text = "int x = 10; while (x > 0) x = x - 1; endwhile; float a = cos(3.14); print(a)"
     lexer = Lexer(text)
     token = lexer.get_next_token()
     while token.type != TOKEN_EOF:
         print(token)
         token = lexer.get_next_token()
+
+
+if __name__ == "__main__":
+    main()
@@ -105,18 +105,20 @@ class CFG:
                 if len(rule) == 1 and rule in self.VT:
                     new_rules.append(rule)
                 else:
-                    temp_rule = ''
+                    # Work on a symbol list: the generated non-terminals are
+                    # several characters long, so string length does not count symbols.
+                    temp_rule = []
                     for sym in rule:
                         if sym in self.VT:
-                            temp_rule += get_new_non_terminal(sym)
+                            temp_rule.append(get_new_non_terminal(sym))
                         else:
-                            temp_rule += sym
+                            temp_rule.append(sym)
                     while len(temp_rule) > 2:
                         new_nt = f"N{len(self.VN)}"
                         self.VN.add(new_nt)
-                        new_productions[new_nt] = [temp_rule[:2]]
-                        temp_rule = new_nt + temp_rule[2:]
-                    new_rules.append(temp_rule)
+                        new_productions[new_nt] = [''.join(temp_rule[:2])]
+                        temp_rule = [new_nt] + temp_rule[2:]
+                    new_rules.append(''.join(temp_rule))
             new_productions[nt] = new_rules
         self.P = new_productions
 
@@ -136,24 +138,29 @@ class CFG:
             print(f"  {nt} → {', '.join(rules)}")
 
 
-#Variant 9 Grammar from Image
-VN = {'S', 'A', 'B', 'C', 'D'}
-VT = {'a', 'b'}
-S = 'S'
-P = {
-    'S': ['bA', 'BC'],
-    'A': ['a', 'aS', 'bAaAb'],
-    'B': ['A', 'bS', 'aAa'],
-    'C': ['ε', 'AB'],
-    'D': ['AB']
-}
+def main():
+    #Variant 9 Grammar from Image
+    VN = {'S', 'A', 'B', 'C', 'D'}
+    VT = {'a', 'b'}
+    S = 'S'
+    P = {
+        'S': ['bA', 'BC'],
+        'A': ['a', 'aS', 'bAaAb'],
+        'B': ['A', 'bS', 'aAa'],
+        'C': ['ε', 'AB'],
+        'D': ['AB']
+    }
 
-grammar = CFG(VN, VT, S, P)
-print("Original Grammar:")
-grammar.print_grammar()
+    grammar = CFG(VN, VT, S, P)
+    print("Original Grammar:")
+    grammar.print_grammar()
 
-# Transform to CNF
-grammar.to_cnf()
+    # Transform to CNF
+    grammar.to_cnf()
 
-print("\nGrammar in CNF:")
-grammar.print_grammar()
+    print("\nGrammar in CNF:")
+    grammar.print_grammar()
+
+
+if __name__ == "__main__":
+    main()
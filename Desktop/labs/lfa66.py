@@ -43,8 +43,9 @@ class Token:
         return f"Token({self.type}, {self.value})"
 
 class Lexer:
-    def __init__(self, contents: str):
+    def __init__(self, contents: str, strict: bool = False):
         self.contents = contents
+        self.strict = strict
         self.i = 0
         self.c = contents[self.i] if contents else '\0'
     
@@ -162,6 +163,8 @@ class Lexer:
                 return token
             
             else:
+                if self.strict:
+                    raise Exception(f"Illegal character {self.c}")
                 print(f"Unknown token: {self.c}")
                 self.advance()
         
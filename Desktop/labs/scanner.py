@@ -0,0 +1,212 @@
+"""Substring search with a compiled DFA and literal-factor prefiltering.
+
+Scanner minimizes an automaton and extracts literal factors from it: the
+literal prefix every match starts with, the set of possible first
+characters, and characters every match must contain.  search() then jumps
+between candidate positions with str.find / bytes.find (C-level memchr and
+fast substring search) and only runs the DFA from there, so on texts where
+matches are sparse almost all of the input is skipped at C speed.
+"""
+from .asl2 import EPSILON, FiniteAutomaton
+
+# Above this many possible first characters a find() per character costs
+# more than it saves.
+MAX_FIRST_CHARS = 3
+
+
+def regex_to_automaton(regex):
+    """Thompson construction for the LFA4 regex syntax: literals, (a|b) groups and postfix * + ?."""
+    transitions = {}
+    pos = 0
+
+    def new_state():
+        state = f"t{len(transitions)}"
+        transitions[state] = {}
+        return state
+
+    def edge(source, symbol, target):
+        transitions[source].setdefault(symbol, set()).add(target)
+
+    def parse_alternation():
+        nonlocal pos
+        start, end = new_state(), new_state()
+        while True:
+            first, last = parse_sequence()
+            edge(start, EPSILON, first)
+            edge(last, EPSILON, end)
+            if pos < len(regex) and regex[pos] == '|':
+                pos += 1
+                continue
+            return start, end
+
+    def parse_sequence():
+        start = end = new_state()
+        while pos < len(regex) and regex[pos] not in '|)':
+            first, last = parse_repeat()
+            edge(end, EPSILON, first)
+            end = last
+        return start, end
+
+    def parse_repeat():
+        nonlocal pos
+        first, last = parse_atom()
+        while pos < len(regex) and regex[pos] in '*+?':
+            operator = regex[pos]
+            pos += 1
+            start, end = new_state(), new_state()
+            edge(start, EPSILON, first)
+            edge(last, EPSILON, end)
+            if operator in '*?':
+                edge(start, EPSILON, end)
+            if operator in '*+':
+                edge(last, EPSILON, first)
+            first, last = start, end
+        return first, last
+
+    def parse_atom():
+        nonlocal pos
+        char = regex[pos]
+        pos += 1
+        if char == '(':
+            first, last = parse_alternation()
+            if pos >= len(regex) or regex[pos] != ')':
+                raise Exception(f"Missing ')' in regex {regex!r}")
+            pos += 1
+            return first, last
+        first, last = new_state(), new_state()
+        edge(first, char, last)
+        return first, last
+
+    start, end = parse_alternation()
+    if pos != len(regex):
+        raise Exception(f"Unexpected {regex[pos]!r} at position {pos} in regex {regex!r}")
+    alphabet = {symbol for paths in transitions.values() for symbol in paths if symbol != EPSILON}
+    return FiniteAutomaton(set(transitions), alphabet, transitions, start, {end})
+
+
+class Scanner:
+    """Leftmost-longest search for the strings accepted by an automaton."""
+
+    def __init__(self, fa):
+        dfa = fa.minimize()
+        self.start = dfa.start_state
+        self.finals = frozenset(dfa.final_states)
+        self.table = {state: {symbol: next(iter(targets)) for symbol, targets in paths.items() if targets}
+                      for state, paths in dfa.transitions.items()}
+        # bytes input iterates as ints, so it gets a table keyed by byte value.
+        self.byte_table = {state: {ord(symbol): target for symbol, target in paths.items()
+                                   if len(symbol) == 1 and ord(symbol) < 256}
+                           for state, paths in self.table.items()}
+        self.prefix = self._literal_prefix()
+        self.first_chars = sorted(self.table[self.start])
+        self.required = self._required_chars()
+
+    def _literal_prefix(self):
+        """Characters every match starts with: the chain of single-exit, non-final states from the start."""
+        prefix = []
+        state, seen = self.start, set()
+        while state not in self.finals and state not in seen and len(self.table[state]) == 1:
+            seen.add(state)
+            (symbol, state), = self.table[state].items()
+            prefix.append(symbol)
+        return ''.join(prefix)
+
+    def _required_chars(self):
+        """Characters without which no final state is reachable from the start."""
+        required = []
+        for symbol in sorted({symbol for paths in self.table.values() for symbol in paths}):
+            if symbol in self.prefix:
+                continue
+            seen, stack = {self.start}, [self.start]
+            while stack:
+                state = stack.pop()
+                if state in self.finals:
+                    break
+                for label, target in self.table[state].items():
+                    if label != symbol and target not in seen:
+                        seen.add(target)
+                        stack.append(target)
+            else:
+                required.append(symbol)
+        return required
+
+    def _run(self, text, i, table):
+        """End of the longest match starting at i, or None."""
+        state = self.start
+        end = i if state in self.finals else None
+        finals = self.finals
+        for j in range(i, len(text)):
+            state = table[state].get(text[j])
+            if state is None:
+                break
+            if state in finals:
+                end = j + 1
+        return end
+
+    def search(self, text, pos=0, prefilter=True):
+        """(start, end) of the leftmost-longest match at or after pos, or None.
+
+        Works on str and on bytes (the automaton's symbols must then be
+        Latin-1 characters).  prefilter=False runs the DFA at every position.
+        """
+        is_bytes = isinstance(text, (bytes, bytearray))
+        table = self.byte_table if is_bytes else self.table
+        encode = (lambda s: s.encode('latin-1')) if is_bytes else (lambda s: s)
+        if not prefilter or self.start in self.finals:
+            for i in range(pos, len(text) + 1):
+                end = self._run(text, i, table)
+                if end is not None:
+                    return i, end
+            return None
+
+        prefix = encode(self.prefix)
+        first_chars = [encode(char) for char in self.first_chars] if len(self.first_chars) <= MAX_FIRST_CHARS else []
+        required = [encode(char) for char in self.required]
+        next_required = [-1] * len(required)
+        find = text.find
+        while pos < len(text):
+            if prefix:
+                i = find(prefix, pos)
+            elif first_chars:
+                hits = [hit for hit in (find(char, pos) for char in first_chars) if hit >= 0]
+                i = min(hits) if hits else -1
+            else:
+                i = pos
+            if i < 0:
+                return None
+            # A match starting at i must contain every required character at or after i.
+            for k, char in enumerate(required):
+                if next_required[k] < i:
+                    next_required[k] = find(char, i)
+                    if next_required[k] < 0:
+                        return None
+            end = self._run(text, i, table)
+            if end is not None:
+                return i, end
+            pos = i + 1
+        return None
+
+    def finditer(self, text, prefilter=True):
+        """Non-overlapping leftmost-longest matches as (start, end) pairs."""
+        pos = 0
+        while pos <= len(text):
+            match = self.search(text, pos, prefilter)
+            if match is None:
+                return
+            yield match
+            pos = match[1] if match[1] > match[0] else match[1] + 1
+
+
+def main():
+    for regex in ["(a|b)(c|d)E+G?", "P(Q|R|S)T(uv|w|x)*Z+", "1(0|1)*2(3|4)5"]:
+        scanner = Scanner(regex_to_automaton(regex))
+        print(f"Regex: {regex}")
+        print(f"  literal prefix: {scanner.prefix!r}, first chars: {scanner.first_chars}, "
+              f"required: {scanner.required}")
+    scanner = Scanner(regex_to_automaton("1(0|1)*2(3|4)5"))
+    text = "xx 1012 5 zz 1001245 y 1235"
+    print(f"Matches in {text!r}:", [text[start:end] for start, end in scanner.finditer(text)])
+
+
+if __name__ == "__main__":
+    main()
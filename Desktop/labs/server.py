@@ -0,0 +1,423 @@
+"""Asyncio validation server speaking line-delimited JSON over TCP.
+
+Each request is one JSON object per line and gets one JSON line back,
+matched by "id" (responses on a connection may arrive out of order):
+
+    {"id": 1, "op": "match", "automaton": "lab2", "input": "abba"}
+    {"id": 2, "op": "tokenize", "lexer": "lfa3", "input": "int x = 1;"}
+    {"id": 3, "op": "parse", "grammar": "expr", "input": "i+i*i"}
+    -> {"id": 1, "result": false}   or   {"id": 1, "error": "..."}
+
+Automata and grammars are compiled once at startup from a JSON config
+(see DEFAULT_CONFIG for the format).  Small match requests are batched
+into one match_many() call per automaton, run in a thread pool like all
+other work except inputs longer than --large-input, which go to a
+process pool; the event loop itself only parses and routes requests.
+--max-pending caps the requests whose work has not finished (reading
+stops until a slot frees up, which pushes back on the client; a request
+that timed out keeps its slot until its job ends) and every response is
+bounded by --timeout.
+
+    python -m labs server serve [--config config.json] [--port 8765]
+    python -m labs server loadgen [--connections 8] [--requests 20000]
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .asl2 import FiniteAutomaton
+from .cfg_tables import LALR1Table
+from .lfa55 import CFG
+
+DEFAULT_CONFIG = {
+    "automata": {
+        "lab2": {
+            "states": ["q0", "q1", "q2", "q3", "q4"],
+            "alphabet": ["a", "b", "c"],
+            "transitions": {
+                "q0": {"a": ["q1"]},
+                "q1": {"b": ["q2", "q3"]},
+                "q2": {"c": ["q0"]},
+                "q3": {"a": ["q4"], "b": ["q0"]},
+            },
+            "start_state": "q0",
+            "final_states": ["q4"],
+        },
+    },
+    "grammars": {
+        "expr": {
+            "non_terminals": ["E", "T", "F"],
+            "terminals": ["+", "*", "(", ")", "i"],
+            "start_symbol": "E",
+            "productions": {"E": ["E+T", "T"], "T": ["T*F", "F"], "F": ["(E)", "i"]},
+        },
+    },
+}
+
+LEXERS = ("lfa3", "lfa66")
+
+
+def compile_automaton(spec):
+    """Minimal DFA of an automaton spec as (transitions, start, finals) with plain state -> symbol -> state dicts."""
+    alphabet = set(spec["alphabet"])
+    transitions = {state: {symbol: set(targets) for symbol, targets in paths.items()}
+                   for state, paths in spec["transitions"].items()}
+    dfa = FiniteAutomaton(set(spec["states"]), alphabet, transitions,
+                          spec["start_state"], set(spec["final_states"])).minimize()
+    table = {state: {symbol: next(iter(targets)) for symbol, targets in paths.items() if targets}
+             for state, paths in dfa.transitions.items()}
+    return table, dfa.start_state, frozenset(dfa.final_states)
+
+
+def compile_grammar(spec):
+    cfg = CFG(set(spec["non_terminals"]), set(spec["terminals"]), spec["start_symbol"],
+              {nt: list(rules) for nt, rules in spec["productions"].items()})
+    table = LALR1Table(cfg)
+    if table.conflicts:
+        raise Exception("Grammar is not LALR(1): " + "; ".join(table.conflicts))
+    return table
+
+
+def compile_config(config):
+    return {
+        "automata": {name: compile_automaton(spec) for name, spec in config.get("automata", {}).items()},
+        "grammars": {name: compile_grammar(spec) for name, spec in config.get("grammars", {}).items()},
+    }
+
+
+def match_many(dfa, strings):
+    """Run one compiled DFA over a batch of strings."""
+    transitions, start, finals = dfa
+    results = []
+    for string in strings:
+        state = start
+        for symbol in string:
+            state = transitions[state].get(symbol)
+            if state is None:
+                break
+        results.append(state in finals)
+    return results
+
+
+def tokenize(lexer_name, text):
+    module = importlib.import_module(f"{__package__}.{lexer_name}")
+    # lfa66 would print unknown characters and skip them; strict mode raises like lfa3 does.
+    lexer = module.Lexer(text, strict=True) if lexer_name == "lfa66" else module.Lexer(text)
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        kind = getattr(token.type, "name", token.type)
+        if kind in ("EOF", "TOKEN_EOF"):
+            return tokens
+        tokens.append([kind, token.value])
+
+
+def parse(table, text):
+    unknown = set(text) - set(table.terminal_ids)
+    if unknown:
+        raise Exception(f"Unknown terminals {sorted(unknown)}")
+    return [list(production) for production in table.parse(table.token_ids(text))]
+
+
+# Process-pool side: every worker compiles the registry once in its initializer.
+_worker_registry = None
+
+
+def _init_worker(config):
+    global _worker_registry
+    _worker_registry = compile_config(config)
+
+
+def _run(registry, op, name, text):
+    if op == "match":
+        return match_many(registry["automata"][name], [text])[0]
+    if op == "tokenize":
+        return tokenize(name, text)
+    return parse(registry["grammars"][name], text)
+
+
+def _run_in_worker(op, name, text):
+    return _run(_worker_registry, op, name, text)
+
+
+def _call_soon(loop, callback, *args):
+    """Schedule callback on the event loop from an executor thread (a no-op once the loop is closed)."""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
+
+
+class Slot:
+    """One --max-pending slot, released exactly once.
+
+    The request releases it when it is answered, unless it handed its work
+    to an executor job: then the job releases it when it actually ends, so
+    work abandoned by a timeout still counts against the limit.
+    """
+
+    def __init__(self, semaphore):
+        self.semaphore = semaphore
+        self.handed_off = False
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.semaphore.release()
+
+    def hand_off(self, job):
+        """Release when the concurrent.futures job is done (from whichever thread finishes it)."""
+        self.handed_off = True
+        loop = asyncio.get_running_loop()
+        job.add_done_callback(lambda _: _call_soon(loop, self.release))
+
+
+class MatchBatcher:
+    """Collects small match requests per automaton and answers them with one match_many() call in an executor."""
+
+    def __init__(self, registry, executor, max_batch=256, delay=0.0005):
+        self.registry = registry
+        self.executor = executor
+        self.max_batch = max_batch
+        self.delay = delay
+        self.pending = {}
+
+    def submit(self, name, text, slot):
+        future = asyncio.get_running_loop().create_future()
+        slot.handed_off = True
+        batch = self.pending.setdefault(name, [])
+        batch.append((text, future, slot))
+        if len(batch) >= self.max_batch:
+            self.flush(name)
+        elif len(batch) == 1:
+            asyncio.get_running_loop().call_later(self.delay, self.flush, name)
+        return future
+
+    def flush(self, name):
+        batch = self.pending.pop(name, None)
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        job = self.executor.submit(match_many, self.registry["automata"][name], [text for text, _, _ in batch])
+        job.add_done_callback(lambda _: _call_soon(loop, self._deliver, batch, job))
+
+    @staticmethod
+    def _deliver(batch, job):
+        error = None if job.cancelled() else job.exception()
+        results = job.result() if not job.cancelled() and error is None else [None] * len(batch)
+        for (_, future, slot), result in zip(batch, results):
+            if not future.done():
+                if job.cancelled():
+                    future.cancel()
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            slot.release()
+
+
+class ValidationServer:
+    def __init__(self, config, workers=2, max_pending=1024, timeout=5.0, large_input=4096, max_batch=256):
+        self.config = config
+        self.registry = compile_config(config)
+        self.threads = ThreadPoolExecutor()
+        self.batcher = MatchBatcher(self.registry, self.threads, max_batch=max_batch)
+        self.workers = workers
+        self.pool = None
+        self.slots = asyncio.Semaphore(max_pending)
+        self.timeout = timeout
+        self.large_input = large_input
+
+    async def dispatch(self, request, slot):
+        op, text = request.get("op"), request.get("input", "")
+        if not isinstance(text, str):
+            raise Exception("input must be a string")
+        name_field = {"match": "automaton", "tokenize": "lexer", "parse": "grammar"}.get(op)
+        if name_field is None:
+            raise Exception(f"Unknown op {op!r}")
+        name = request.get(name_field)
+        known = LEXERS if op == "tokenize" else self.registry["automata" if op == "match" else "grammars"]
+        if name not in known:
+            raise Exception(f"Unknown {name_field} {name!r}")
+
+        if len(text) <= self.large_input and op == "match":
+            return await self.batcher.submit(name, text, slot)
+        # wait_for cannot interrupt synchronous code, so everything runs in an
+        # executor: the timeout then holds and other connections keep going.
+        if len(text) > self.large_input and self.pool is not None:
+            job = self.pool.submit(_run_in_worker, op, name, text)
+        else:
+            job = self.threads.submit(_run, self.registry, op, name, text)
+        slot.hand_off(job)
+        return await asyncio.wrap_future(job)
+
+    async def respond(self, line, writer, write_lock):
+        slot = Slot(self.slots)
+        try:
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                response = {"id": request_id,
+                            "result": await asyncio.wait_for(self.dispatch(request, slot), self.timeout)}
+            except asyncio.TimeoutError:
+                response = {"id": request_id, "error": f"timed out after {self.timeout}s"}
+            except Exception as error:
+                response = {"id": request_id, "error": str(error)}
+            async with write_lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if not slot.handed_off:
+                slot.release()
+
+    async def handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                # Stop reading while every slot is busy: the kernel buffers
+                # fill up and the client is throttled.
+                await self.slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    self.slots.release()
+                    break
+                task = asyncio.create_task(self.respond(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        if self.workers:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.config,))
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=64 * 1024 * 1024)
+        if ready is not None:
+            ready.set_result(server.sockets[0].getsockname()[1])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Joining the workers blocks, so do it off the event loop.
+            for executor in (self.pool, self.threads):
+                if executor is not None:
+                    await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+
+async def load_generator(host, port, connections=8, requests=20000, window=64, automaton="lab2",
+                         alphabet="abc", max_length=12, seed=0):
+    """Pipelined match requests over several connections; returns throughput and latency percentiles."""
+    rng = random.Random(seed)
+    latencies = []
+    # Spread the requests as evenly as possible; some connections may get none.
+    counts = [requests // connections + (i < requests % connections) for i in range(connections)]
+    first_ids = [sum(counts[:i]) for i in range(connections)]
+
+    async def client(index):
+        per_connection = counts[index]
+        if not per_connection:
+            return
+        reader, writer = await asyncio.open_connection(host, port, limit=64 * 1024 * 1024)
+        sent = {}
+        in_flight = asyncio.Semaphore(window)
+
+        async def receive():
+            for _ in range(per_connection):
+                response = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - sent.pop(response["id"]))
+                in_flight.release()
+
+        receiver = asyncio.create_task(receive())
+        for i in range(per_connection):
+            await in_flight.acquire()
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+            request_id = first_ids[index] + i
+            sent[request_id] = time.perf_counter()
+            writer.write((json.dumps({"id": request_id, "op": "match", "automaton": automaton,
+                                      "input": text}) + "\n").encode())
+            await writer.drain()
+        await receiver
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else None,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000 if latencies else None,
+    }
+
+
+async def _serve_and_load(server, args):
+    ready = asyncio.get_running_loop().create_future()
+    serving = asyncio.create_task(server.serve(args.host, 0, ready))
+    port = await ready
+    try:
+        return await load_generator(args.host, port, args.connections, args.requests, args.window)
+    finally:
+        serving.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["serve", "loadgen"])
+    parser.add_argument("--config", help="JSON file with 'automata' and 'grammars' (default: built-in demo)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="process pool size for large inputs (0 disables)")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--large-input", type=int, default=4096, help="input length sent to the process pool")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=64, help="pipelined requests per connection")
+    parser.add_argument("--external", action="store_true",
+                        help="loadgen against a running server at --host/--port instead of an in-process one")
+    args = parser.parse_args(argv)
+
+    config = DEFAULT_CONFIG
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+
+    def make_server():
+        return ValidationServer(config, args.workers, args.max_pending, args.timeout, args.large_input)
+
+    if args.command == "serve":
+        async def serve():
+            await make_server().serve(args.host, args.port)
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.external:
+        report = asyncio.run(load_generator(args.host, args.port, args.connections, args.requests, args.window))
+    else:
+        async def run():
+            return await _serve_and_load(make_server(), args)
+        report = asyncio.run(run())
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
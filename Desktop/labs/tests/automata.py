@@ -0,0 +1,16 @@
+"""Small automata and word lists shared by the tests."""
+from itertools import product
+
+from labs.asl2 import EPSILON, FiniteAutomaton
+
+
+def words(alphabet, max_length):
+    return [''.join(word) for length in range(max_length + 1) for word in product(alphabet, repeat=length)]
+
+
+def random_nfa(rng, n=4, alphabet='ab'):
+    states = [f"s{i}" for i in range(n)]
+    transitions = {state: {symbol: set(rng.sample(states, rng.randint(0, 2))) for symbol in alphabet + EPSILON}
+                   for state in states}
+    return FiniteAutomaton(set(states), set(alphabet), transitions, states[0], set(rng.sample(states, 1)))
+
@@ -0,0 +1,65 @@
+import random
+
+from labs.asl2 import FiniteAutomaton
+
+from .automata import random_nfa, words
+
+
+def test_subset_states_do_not_collide():
+    # {a, b} and {ab} used to get the same DFA state name "ab".
+    transitions = {
+        's': {'x': {'a', 'b'}, 'y': {'ab'}},
+        'a': {},
+        'b': {'x': {'a'}},
+        'ab': {'x': {'ab'}},
+    }
+    fa = FiniteAutomaton({'s', 'a', 'b', 'ab'}, {'x', 'y'}, transitions, 's', {'a'})
+    dfa = fa.ndfa_to_dfa()
+    assert len(dfa.states) == 4
+    minimal = fa.minimize()
+    for word in ['x', 'xx', 'y', 'yx', 'yxx']:
+        assert minimal.accepts(word) == fa.accepts(word) == dfa.accepts(word), word
+
+
+def test_non_string_states():
+    transitions = {0: {'a': {0, 1}}, 1: {'b': {2}}, 2: {}}
+    fa = FiniteAutomaton({0, 1, 2}, {'a', 'b'}, transitions, 0, {2})
+    dfa = fa.ndfa_to_dfa()
+    assert dfa.accepts('ab') and dfa.accepts('aab') and not dfa.accepts('a')
+
+
+def test_edits_invalidate_caches():
+    transitions = {'q0': {'a': {'q1'}}, 'q1': {}}
+    fa = FiniteAutomaton({'q0', 'q1'}, {'a'}, transitions, 'q0', {'q1'})
+    assert fa.accepts('a') and not fa.accepts('aa')
+    fa.cache['marker'] = True
+    fa.add_transition('q1', 'a', 'q1')
+    assert fa.accepts('aa')
+    assert 'marker' not in fa.cache
+    fa.transitions['q1']['a'] = set()
+    fa.invalidate_closures()
+    assert not fa.accepts('aa')
+
+
+def test_list_arguments_are_normalized():
+    fa = FiniteAutomaton(['q0', 'q1'], {'a'}, {'q0': {'a': ['q1']}}, 'q0', ['q1'])
+    assert fa.accepts('a')
+    fa.cache['marker'] = True
+    assert fa.accepts('a') and fa.cache['marker']
+
+
+def test_products_and_complement_match_accepts():
+    rng = random.Random(0)
+    for _ in range(100):
+        a, b = random_nfa(rng), random_nfa(rng)
+        operations = [
+            (a.intersection(b), lambda w: a.accepts(w) and b.accepts(w)),
+            (a.union(b), lambda w: a.accepts(w) or b.accepts(w)),
+            (a.difference(b), lambda w: a.accepts(w) and not b.accepts(w)),
+            (a.complement(), lambda w: not a.accepts(w)),
+            (a.minimize(), a.accepts),
+        ]
+        for word in words('ab', 6):
+            for result, expected in operations:
+                assert result.accepts(word) == expected(word), word
+        assert a.intersection_is_empty(b) == (not a.intersection(b).final_states)
@@ -0,0 +1,34 @@
+import pytest
+
+from labs.cfg_tables import LL1Table, LALR1Table, token_kind_ids
+from labs.lfa55 import CFG
+from labs.lfa66 import Lexer, TokenType
+
+# Sums of identifiers and numbers over lfa66's token kinds, without left recursion.
+SUMS = CFG({'S', 'E', 'X', 'A'}, {'TOKEN_ID', 'TOKEN_NUMBER', 'TOKEN_PLUS', 'TOKEN_SEMI'}, 'S',
+           {'S': [['E', 'TOKEN_SEMI']], 'E': [['A', 'X']], 'X': [['TOKEN_PLUS', 'A', 'X'], ['ε']],
+            'A': [['TOKEN_ID'], ['TOKEN_NUMBER']]})
+
+
+@pytest.mark.parametrize('table_class', [LL1Table, LALR1Table])
+def test_parse_lfa66_token_stream(table_class):
+    table = table_class(SUMS, token_kind_ids(TokenType), TokenType.TOKEN_EOF.value)
+    assert table.conflicts == []
+    derivation = table.parse(table.lexer_token_ids(Lexer("x + 1 + y;")))
+    assert derivation.count(('A', ('TOKEN_ID',))) == 2
+    with pytest.raises(Exception):
+        table.parse(table.lexer_token_ids(Lexer("x + ;")))
+
+
+def test_saved_tables_are_keyed_by_grammar(tmp_path):
+    ids = token_kind_ids(TokenType)
+    path = tmp_path / 'sums.lalr'
+    LALR1Table(SUMS, ids, TokenType.TOKEN_EOF.value).save(path)
+    table = LALR1Table.load(path, SUMS, ids, TokenType.TOKEN_EOF.value)
+    assert table.parse(table.lexer_token_ids(Lexer("x + 1;")))
+    changed = CFG(SUMS.VN, SUMS.VT, SUMS.S, dict(SUMS.P, A=[['TOKEN_ID']]))
+    for args in [(changed, ids, TokenType.TOKEN_EOF.value), (SUMS, ids, 99), (SUMS,)]:
+        with pytest.raises(Exception):
+            LALR1Table.load(path, *args)
+    with pytest.raises(Exception):
+        LL1Table.load(path, SUMS, ids, TokenType.TOKEN_EOF.value)
@@ -0,0 +1,25 @@
+import pytest
+
+from labs.asl2 import FiniteAutomaton
+from labs.charclass import ALNUM, ALPHA, CharClass, ClassDFA, as_char_class
+
+
+def overlapping():
+    transitions = {'s': {ALPHA: {'a'}, CharClass.range('a', 'f'): {'b'}}, 'a': {ALNUM: {'a'}}, 'b': {}}
+    return FiniteAutomaton({'s', 'a', 'b'}, set(), transitions, 's', {'a'})
+
+
+def test_class_dfa_interprets_overlapping_labels():
+    assert ClassDFA(overlapping()).accepts('b1')
+
+
+def test_class_labels_rejected_outside_class_dfa():
+    fa = overlapping()
+    for operation in (lambda: fa.accepts('b1'), fa.as_dfa, fa.minimize):
+        with pytest.raises(Exception):
+            operation()
+
+
+def test_multi_character_label_rejected():
+    with pytest.raises(Exception):
+        as_char_class('ab')
@@ -0,0 +1,32 @@
+import random
+
+from labs.counting import language
+from labs.scanner import regex_to_automaton
+
+from .automata import random_nfa, words
+
+
+def test_counts_and_strings_match_enumeration():
+    rng = random.Random(3)
+    for _ in range(100):
+        fa = random_nfa(rng)
+        lang = language(fa)
+        accepted = [w for w in words('ab', 6) if fa.accepts(w)]  # in shortlex order
+        for length in range(7):
+            assert lang.count(length) == sum(len(w) == length for w in accepted)
+            assert lang.count_up_to(length) == sum(len(w) <= length for w in accepted)
+        assert list(lang.strings(6)) == accepted
+        witness = lang.shortest_witness()
+        if accepted:
+            assert witness == accepted[0]
+        else:
+            assert witness is None or len(witness) > 6
+        assert lang.count(5, modulus=7) == lang.count(5) % 7
+
+
+def test_finite_language():
+    lang = language(regex_to_automaton("(a|b)(c|d)"))
+    assert lang.is_finite() and lang.longest_length() == 2
+    assert list(lang.strings()) == ['ac', 'ad', 'bc', 'bd']
+    assert lang.count_up_to(10 ** 6) == 4
+    assert language(regex_to_automaton("ab*")).count_up_to(10) == 10
@@ -0,0 +1,35 @@
+import random
+
+from labs.equivalence import equivalent, included
+from labs.finite_automaton import Grammar
+
+from .automata import random_nfa, words
+
+
+def check(result, differs, max_length=6):
+    """result is (holds, counterexample); differs(w) says whether w violates the relation."""
+    holds, counterexample = result
+    shortest = next((w for w in words('ab', max_length) if differs(w)), None)
+    if holds:
+        assert counterexample is None and shortest is None
+    else:
+        assert differs(counterexample)
+        if shortest is not None:
+            assert len(counterexample) == len(shortest)
+
+
+def test_equivalent_and_included_give_shortest_counterexamples():
+    rng = random.Random(1)
+    for _ in range(200):
+        a, b = random_nfa(rng), random_nfa(rng)
+        check(equivalent(a, b), lambda w: a.accepts(w) != b.accepts(w))
+        check(included(a, b), lambda w: a.accepts(w) and not b.accepts(w))
+        assert equivalent(a, a.minimize()) == (True, None)
+        assert included(a.intersection(b), a) == (True, None)
+
+
+def test_finite_automaton_flavour():
+    fa = Grammar().to_finite_automaton()
+    assert equivalent(fa, fa) == (True, None)
+    holds, counterexample = included(fa, random_nfa(random.Random(2), alphabet='abcd'))
+    assert holds or fa.string_belongs_to_language(counterexample)
@@ -0,0 +1,45 @@
+import pytest
+
+from labs import instrumentation
+from labs.asl2 import FiniteAutomaton
+from labs.charclass import ALPHA, CharClass
+
+WORDS = ['', 'a', 'aa', 'aaa', 'b']
+
+
+def automaton():
+    return FiniteAutomaton({'q0', 'q1'}, {'a'}, {'q0': {'a': {'q1'}}, 'q1': {}}, 'q0', {'q1'})
+
+
+@pytest.fixture
+def registry():
+    registry = instrumentation.enable(instrumentation.Metrics())
+    yield registry
+    instrumentation.disable()
+
+
+def test_accepts_unchanged_by_instrumentation(registry):
+    plain = automaton()
+    fa = automaton()
+    expected = [automaton().accepts(word) for word in WORDS]
+    assert [fa.accepts(word) for word in WORDS] == expected
+    fa.add_transition('q1', 'a', 'q1')
+    plain.add_transition('q1', 'a', 'q1')
+    assert fa.accepts('aa') and fa.ndfa_to_dfa().accepts('aa')
+    instrumentation.disable()
+    assert [fa.accepts(word) for word in WORDS] == [plain.accepts(word) for word in WORDS]
+
+
+def test_instrumented_accepts_keeps_class_label_guard(registry):
+    fa = FiniteAutomaton({'s', 'a'}, set(), {'s': {ALPHA: {'a'}, CharClass.range('a', 'f'): {'a'}}}, 's', {'a'})
+    with pytest.raises(Exception):
+        fa.accepts('b')
+
+
+def test_visits_labelled_per_instance(registry):
+    first, second = automaton(), automaton()
+    first.name = 'first'
+    first.accepts('a')
+    second.accepts('a')
+    labels = {entry['labels']['automaton'] for entry in registry.snapshot()['fa_state_visits_total']}
+    assert 'first' in labels and len(labels) == 2
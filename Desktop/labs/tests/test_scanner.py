@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from labs.scanner import Scanner, regex_to_automaton
+
+REGEXES = ["1(0|1)*2(3|4)5", "(a|b)(c|d)E+G?", "ab*", "a?b"]
+
+
+def brute_search(fa, text, pos=0):
+    """Leftmost-longest match by trying every substring."""
+    for start in range(pos, len(text) + 1):
+        ends = [end for end in range(start, len(text) + 1) if fa.accepts(text[start:end])]
+        if ends:
+            return start, max(ends)
+    return None
+
+
+@pytest.mark.parametrize('regex', REGEXES)
+def test_search_matches_brute_force(regex):
+    fa = regex_to_automaton(regex)
+    scanner = Scanner(fa)
+    alphabet = sorted(set(regex) - set('()|*+?')) + ['x']
+    rng = random.Random(regex)
+    for _ in range(200):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        expected = brute_search(fa, text)
+        for prefilter in (True, False):
+            assert scanner.search(text, prefilter=prefilter) == expected, text
+            assert scanner.search(text.encode('latin-1'), prefilter=prefilter) == expected, text
+
+
+def test_finditer_sparse_matches():
+    scanner = Scanner(regex_to_automaton("1(0|1)*2(3|4)5"))
+    text = "xx 1012 5 zz 1001245 y 1235"
+    assert [text[start:end] for start, end in scanner.finditer(text)] == ["1001245", "1235"]